@@ -1,45 +1,52 @@
-import bpy
+import _extra_tools as tools
+
+
+metadata = {
+    'uses_texture': False,
+    'animated': False,
+    'needs_shadows': True,
+    'cost': 1.2,
+    'prepare': lambda data: background_normal_map(data['cache_directory'])
+}
+
+
+def background_normal_map(cache_directory):
+    """The voronoi and noise bump pattern never changes, so it is baked once to a cached normal map"""
+    def make_pixels():
+        size = 2048
+        height = (tools.voronoi_distance(size, 150, seed=1) * 0.2) + (tools.value_noise(size, 35, detail=8, seed=2) * 0.8)
+        return tools.normal_map_from_height(height, 2.5, strength=0.5, invert=True)
+    return tools.cached_array_image(cache_directory, 'background_normal', [2048, 150, 35, 8, 0.5], make_pixels, non_color=True)
+
+
+def background_mesh(cache_directory):
+    def build_material(name):
+        background_material = tools.new_material(name)
+        node_tree = background_material.node_tree
+        nodes = node_tree.nodes
+        background_shaded = tools.get_principled(background_material)
+        background_texture = nodes.new("ShaderNodeTexImage")
+        background_texture.image = background_normal_map(cache_directory)
+        background_normal = nodes.new("ShaderNodeNormalMap")
+        node_tree.links.new(background_texture.outputs["Color"], background_normal.inputs["Color"])
+        node_tree.links.new(background_normal.outputs["Normal"], background_shaded.inputs["Normal"])
+        background_shaded.inputs["Roughness"].default_value = 0.4
+        background_shaded.inputs["Base Color"].default_value = (0.1, 0.1, 0.1, 1)
+        return background_material
+
+    def build(name):
+        mesh = tools.plane_mesh(name, 2.5, 2.5)
+        mesh.materials.append(tools.get_asset('materials', 'Textured Dark Background', build_material))
+        return mesh
+    return tools.get_asset('meshes', 'Textured Dark Background', build)
 
 
 def extra(data):
     image_scene = data['image_scene']
     camera = data['camera']
-    bpy.context.window.scene = image_scene
-    bpy.ops.mesh.primitive_plane_add(size=2.5, location=(0, 0, -3))
-    background_plane = bpy.context.active_object
-    background_plane.name = 'Textured Dark Background'
-    modifier = background_plane.modifiers.new(name='', type='SUBSURF')
-    modifier.render_levels = 1
-    modifier.subdivision_type = 'SIMPLE'
-    bpy.ops.object.light_add(type='SPOT', location=(0, 0, -0.7))
-    background_lamp = bpy.context.active_object
+    mesh = background_mesh(data['cache_directory'])
+    background_plane = tools.add_object(image_scene, 'Textured Dark Background', mesh, location=(0, 0, -3), parent=camera)
+    tools.add_subsurf(background_plane)
+    background_lamp = tools.add_light(image_scene, 'Textured Dark Background Lamp', 'SPOT', energy=50, location=(0, 0, -0.7), parent=camera)
     background_lamp.data.spot_size = 1.48353
-    background_lamp.data.energy = 50
     background_lamp.data.shadow_soft_size = 0.05
-    background_plane.parent = camera
-    background_lamp.parent = camera
-    background_material = bpy.data.materials.new('Textured Dark Background')
-    background_plane.data.materials.append(background_material)
-    background_material.use_nodes = True
-    node_tree = background_material.node_tree
-    nodes = node_tree.nodes
-    for node in nodes:
-        if node.type == 'BSDF_PRINCIPLED':
-            background_shaded = node
-    background_tex_one = nodes.new("ShaderNodeTexVoronoi")
-    background_tex_one.inputs["Scale"].default_value = 150
-    background_tex_two = nodes.new("ShaderNodeTexNoise")
-    background_tex_two.inputs["Scale"].default_value = 35
-    background_tex_two.inputs["Detail"].default_value = 8
-    background_tex_two.inputs["Distortion"].default_value = 0.2
-    background_tex_mix = nodes.new("ShaderNodeMixRGB")
-    background_tex_mix.inputs["Fac"].default_value = 0.8
-    background_bump = nodes.new("ShaderNodeBump")
-    background_bump.invert = True
-    background_bump.inputs["Strength"].default_value = 0.5
-    node_tree.links.new(background_tex_one.outputs["Distance"], background_tex_mix.inputs[1])
-    node_tree.links.new(background_tex_two.outputs["Fac"], background_tex_mix.inputs[2])
-    node_tree.links.new(background_tex_mix.outputs[0], background_bump.inputs["Height"])
-    node_tree.links.new(background_bump.outputs["Normal"], background_shaded.inputs["Normal"])
-    background_shaded.inputs["Roughness"].default_value = 0.4
-    background_shaded.inputs["Base Color"].default_value = (0.1, 0.1, 0.1, 1)
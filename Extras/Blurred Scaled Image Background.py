@@ -1,21 +1,50 @@
 import bpy
+import _extra_tools as tools
+
+
+metadata = {
+    'uses_texture': False,
+    'animated': False,
+    'needs_shadows': False,
+    'cost': 1.2
+}
+
+
+def backdrop_material(image):
+    def build(name):
+        material = bpy.data.materials.new(name)
+        material.use_nodes = True
+        node_tree = material.node_tree
+        nodes = node_tree.nodes
+        nodes.clear()
+        output = nodes.new('ShaderNodeOutputMaterial')
+        emission = nodes.new('ShaderNodeEmission')
+        texture = nodes.new('ShaderNodeTexImage')
+        texture.image = image
+        texture.extension = 'EXTEND'
+        node_tree.links.new(texture.outputs[0], emission.inputs[0])
+        node_tree.links.new(emission.outputs[0], output.inputs[0])
+        return material
+    return tools.get_asset('materials', 'Blurred '+image.name, build)
 
 
 def extra(data):
     image_scene = data['image_scene']
-    camera = data['camera']
     image_plane = data['image_plane']
     extra_amount = data['extra_amount']
-    bpy.context.window.scene = image_scene
+    source_image = data['material_texture'].image
+    if source_image is None:
+        return
+
+    #the blur is made once as a small cached image instead of using depth of field
+    blurred = tools.blurred_image(source_image, extra_amount, data['cache_directory'])
 
-    #duplicate image_plane
-    bpy.ops.object.select_all(action='DESELECT')
-    image_plane.select_set(True)
-    bpy.ops.object.duplicate(linked=False)
-    blurred_plane = bpy.context.selected_objects[0]
-    modifier = blurred_plane.modifiers.new(name='', type='SUBSURF')
-    modifier.render_levels = 1
-    modifier.subdivision_type = 'SIMPLE'
+    #copy image_plane, sharing its mesh but with its own material
+    blurred_plane = image_plane.copy()
+    blurred_plane.name = image_plane.name+' Blurred'
+    image_scene.collection.objects.link(blurred_plane)
+    blurred_plane.material_slots[0].link = 'OBJECT'
+    blurred_plane.material_slots[0].material = backdrop_material(blurred)
 
     #remove constraints
     for constraint in blurred_plane.constraints:
@@ -31,7 +60,3 @@ def extra(data):
     blurred_plane.scale = (blurred_plane.scale * scale_factor)
     location = blurred_plane.location
     blurred_plane.location = (0, 0, (location[2] - 100))
-
-    #set up depth of field
-    camera.data.dof.use_dof = True
-    camera.data.dof.aperture_fstop = 3 - (extra_amount * 2)
@@ -1,10 +1,14 @@
-import bpy
+metadata = {
+    'uses_texture': False,
+    'animated': False,
+    'needs_shadows': False,
+    'cost': 2.0
+}
 
 
 def extra(data):
     image_scene = data['image_scene']
     extra_amount = data['extra_amount']
-    bpy.context.window.scene = image_scene
     image_scene.use_nodes = True
     nodes = image_scene.node_tree.nodes
     for node in nodes:
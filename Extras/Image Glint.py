@@ -1,20 +1,25 @@
 import bpy
+import _extra_tools as tools
+
+
+metadata = {
+    'uses_texture': False,
+    'animated': True,
+    'needs_shadows': False,
+    'cost': 1.5
+}
 
 
 def extra(data):
     image_scene = data['image_scene']
-    bpy.context.window.scene = image_scene
     material_mix = data['material_mix']
     material_mix.inputs[0].default_value = 1
     material_shaded = data['material_shaded']
     material_shaded.inputs['Roughness'].default_value = 0.3
 
-    bpy.ops.object.light_add(type='SUN', location=(0, 0, 0))
-    lamp = bpy.context.active_object
-    bpy.ops.object.light_add(type='SUN', location=(0, 0, 0))
-    world_lamp = bpy.context.active_object
+    lamp = tools.add_light(image_scene, 'Sun Lamp Glint', 'SUN')
+    world_lamp = tools.add_light(image_scene, 'Sun Lamp World', 'SUN', energy=3)
     world_lamp.data.specular_factor = 0
-    world_lamp.data.energy = 3
 
     lamp.animation_data_create()
     lamp_action = bpy.data.actions.new('Sun Lamp Glint')
@@ -1,22 +1,40 @@
-import bpy
+#Optional, describes the extra to the generator, any key left out uses the default shown here.
+#   'uses_texture' - set to False if 'extra_texture' is never used, so the extra texture is not loaded for this extra.
+#   'animated' - set to False if nothing added by the extra moves or changes over the slide.
+#   'needs_shadows' - set to False if the extra does not rely on shadows, so shadows are turned off for the slide scene.
+#   'cost' - how expensive the slide is to render compared to a slide with a simple extra, used to schedule expensive slides first.
+#   'prepare' - a function called once per build before any slide is created, with a dictionary of 'generator_scene' and 'slides' using this extra.
+#       Use it for work that is the same for every slide, such as loading assets.
+metadata = {
+    'uses_texture': True,
+    'animated': True,
+    'needs_shadows': True,
+    'cost': 1.0,
+    'prepare': None
+}
 
 
 def extra(data):
-    bpy.context.window.scene = data['image_scene']
-
     #This is meant as a template for new extras, the extra with the filename 'None' will always be ignored by the generator.
     #
     #Rules:
     #   This script's filename will determine the name of the extra listed in the UI.
-    #   This script may import data from a .blend file of the same file name as the script.
+    #   This script may import data from a .blend file of the same file name as the script, see tools.load_asset below.
     #   This script may add whatever it pleases to the passed in scene, but it should not adjust any other scene.
+    #   Objects should be created through bpy.data rather than operators, so the extra does not depend on the active scene and can run without a window.
+    #   The helpers in '_extra_tools.py' create planes, rings, text, lights and copies of objects this way, import it with: import _extra_tools as tools
+    #   Files starting with an underscore are not listed as extras.
+    #   Meshes, materials and node groups that are the same for every slide should be shared with tools.get_asset(collection_name, key, build),
+    #       build is only called the first time a key is asked for, so a material keyed by its settings is created once instead of once per slide.
+    #       Assets in the .blend file next to this script can be appended once and shared with tools.load_asset(__file__, collection_name, name).
+    #       Do not change a shared asset per slide, put the setting in the key instead.
     #   The image_plane will be located at the point (0, 0, 0).  It will be 1 blender unit long on it's y axis, and it will be facing in the positive global z direction.
     #   The camera will be located about 1.93 blender units (depending on the transform) above the plane in the global z direction, and pointing in the global negative z direction.
     #
     #Passed in variable is a dictionary with the following keys:
     #   'image_scene' - a Blender Scene
     #       This is the scene that the slide has been placed in.
-    #       The script should be working in this scene, so starting with setting the current scene to image_scene is a good idea.
+    #       The script should be adding its objects to this scene, this is not the active scene of the window.
     #
     #   'image_plane' - a 3D Object, specifically a mesh plane
     #       This is the plane object that the slide image is on.
@@ -48,6 +66,7 @@ def extra(data):
     #       This is the scene camera.
     #       This is already set up and parented to the transform, and will be moving and/or scaled in most cases.
     #       If you wish for an object to be stationary relative to the camera, make sure to parent it to this.
+    #       The camera data and the scene world are shared between all slides, assign a copy before changing them, eg: camera.data = camera.data.copy()
     #
     #   'extra_amount' - a float variable between 0.0 and 1.0
     #       This is exposed to the UI and is meant to control the 'strength' of the extra scene - for instance the amount of blur on a blurred background, or the extrusion amount of text.
@@ -58,3 +77,28 @@ def extra(data):
     #
     #   'extra_texture' - a Blender Image, or a None if not able to be loaded
     #       This is exposed to the UI and can be a still image or a video.
+    #       The same image is given to every slide using the same file, so do not change it.
+    #       Videos may have been transcoded to an image sequence, use tools.image_frame_count() for the length.
+    #
+    #   'cache_directory' - a string, the absolute path of a directory that exists
+    #       Files that are expensive to make and the same every build, such as prefiltered images, should be saved here and reused.
+    #       Name them by everything they depend on, tools.cache_path() does this.
+    pass
+
+
+#Optional, for extras that only add camera space objects such as vignettes or overlays.
+#If this exists and 'Composite Overlay Extras' is enabled, extra() is not called, and the result of this is composited over the slide in the sequencer instead.
+#This is done once per unique result, so slides using the same overlay share it.
+#Passed in variable is a dictionary with the keys 'resolution', 'frames', 'fps', 'extra_amount', 'extra_text', 'extra_texture' and 'cache_directory'.
+#Return None to show nothing, or a dictionary with one of:
+#   'image' - the path of a still image with alpha, such as one made with tools.cached_array_image()
+#   'movie' - the path of a movie
+#   'directory' and 'files' - an image sequence, such as a transcoded extra texture from tools.sequence_files()
+#   'render' - a function called with (scene, camera, data) that adds objects parented to the camera, they are rendered once with a transparent background.
+#       'key' should then be a list of everything the render depends on besides resolution and length, eg: ['My Extra', data['extra_amount']]
+#and optionally:
+#   'opacity' - the strip opacity, 1.0 by default
+#   'blend_type' - the strip blend mode, 'ALPHA_OVER' by default
+#   'fit_method' - how images and movies are fit to the frame, 'FILL' by default
+#def overlay(data):
+#    return None
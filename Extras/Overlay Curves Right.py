@@ -1,36 +1,38 @@
 import bpy
+import _extra_tools as tools
 
 
-def extra(data):
-    camera = data['camera']
-    extra_amount = data['extra_amount']
-    image_scene = data['image_scene']
-    bpy.context.window.scene = image_scene
+metadata = {
+    'uses_texture': False,
+    'animated': True,
+    'needs_shadows': False,
+    'cost': 1.0
+}
+
 
-    #set up material
-    circles_material = bpy.data.materials.new('Circles')
+def build_material(name):
+    circles_material = tools.new_material(name)
     circles_material.blend_method = 'BLEND'
-    circles_material.use_nodes = True
-    node_tree = circles_material.node_tree
-    nodes = node_tree.nodes
-    for node in nodes:
-        if node.type == 'BSDF_PRINCIPLED':
-            shader = node
-            shader.inputs["Base Color"].default_value = (0.411, 0.411, 0.411, 1)
-            shader.inputs["Emission Strength"].default_value = 0.411
-            shader.inputs["Roughness"].default_value = 0.2
-            shader.inputs["Alpha"].default_value = 0.333
+    shader = tools.get_principled(circles_material)
+    shader.inputs["Base Color"].default_value = (0.411, 0.411, 0.411, 1)
+    shader.inputs["Emission Strength"].default_value = 0.411
+    shader.inputs["Roughness"].default_value = 0.2
+    shader.inputs["Alpha"].default_value = 0.333
+    return circles_material
+
+
+def circle_mesh(radius):
+    """The ring meshes are the same for every slide, so they are shared with the material already assigned"""
+    def build(name):
+        mesh = tools.ring_mesh(name, vertices=128, radius=radius, outer_scale=4)
+        mesh.materials.append(tools.get_asset('materials', 'Circles', build_material))
+        return mesh
+    return tools.get_asset('meshes', 'Circles '+str(radius), build)
+
 
+def add_circles(image_scene, camera, extra_amount):
     #set up circle 1
-    bpy.ops.mesh.primitive_circle_add(vertices=128, radius=1, enter_editmode=True)
-    bpy.ops.mesh.extrude_region()
-    bpy.ops.transform.resize(value=(4, 4, 4))
-    bpy.ops.mesh.flip_normals()
-    bpy.ops.object.mode_set(mode='OBJECT')
-    circle1 = bpy.context.active_object
-    circle1.name = 'Circle 1'
-    circle1.data.materials.append(circles_material)
-    circle1.location = (0, 0, -0.73)
+    circle1 = tools.add_object(image_scene, 'Circle 1', circle_mesh(1), location=(0, 0, -0.73), parent=camera)
     circle1.animation_data_create()
     circle1.animation_data.action = bpy.data.actions.new('circle1')
     fcurvex = circle1.animation_data.action.fcurves.new('location', index=0)
@@ -48,18 +50,9 @@ def extra(data):
     modifier.scale = 100
     modifier.strength = 0.2
     modifier.offset = 910.6
-    circle1.parent = camera
 
     #set up circle2
-    bpy.ops.mesh.primitive_circle_add(vertices=128, radius=1, enter_editmode=True)
-    bpy.ops.mesh.extrude_region()
-    bpy.ops.transform.resize(value=(4, 4, 4))
-    bpy.ops.mesh.flip_normals()
-    bpy.ops.object.mode_set(mode='OBJECT')
-    circle2 = bpy.context.active_object
-    circle2.name = 'Circle 2'
-    circle2.data.materials.append(circles_material)
-    circle2.location = (0, 0, -0.93)
+    circle2 = tools.add_object(image_scene, 'Circle 2', circle_mesh(1), location=(0, 0, -0.93), parent=camera)
     circle2.animation_data_create()
     circle2.animation_data.action = bpy.data.actions.new('circle2')
     fcurvex = circle2.animation_data.action.fcurves.new('location', index=0)
@@ -77,18 +70,9 @@ def extra(data):
     modifier.scale = 100
     modifier.strength = 0.2
     modifier.offset = 1200
-    circle2.parent = camera
 
     #set up circle3
-    bpy.ops.mesh.primitive_circle_add(vertices=128, radius=1.4, enter_editmode=True)
-    bpy.ops.mesh.extrude_region()
-    bpy.ops.transform.resize(value=(4, 4, 4))
-    bpy.ops.mesh.flip_normals()
-    bpy.ops.object.mode_set(mode='OBJECT')
-    circle3 = bpy.context.active_object
-    circle3.name = 'Circle 3'
-    circle3.data.materials.append(circles_material)
-    circle3.location = (0, 0, -1.1)
+    circle3 = tools.add_object(image_scene, 'Circle 3', circle_mesh(1.4), location=(0, 0, -1.1), parent=camera)
     circle3.animation_data_create()
     circle3.animation_data.action = bpy.data.actions.new('circle3')
     fcurvex = circle3.animation_data.action.fcurves.new('location', index=0)
@@ -106,13 +90,19 @@ def extra(data):
     modifier.scale = 100
     modifier.strength = 0.2
     modifier.offset = 200
-    circle3.parent = camera
 
     #set up lamp
-    bpy.ops.object.light_add(type='SPOT', location=(-0.33888, 0, 0.32165), rotation=(0.0, -0.201527, 0))
-    lamp = bpy.context.active_object
-    lamp.name = 'Circles Lamp'
+    lamp = tools.add_light(image_scene, 'Circles Lamp', 'SPOT', energy=200, location=(-0.33888, 0, 0.32165), rotation=(0.0, -0.201527, 0), parent=camera)
     lamp.data.use_shadow = False
     lamp.data.spot_blend = 1
-    lamp.data.energy = 200
-    lamp.parent = camera
+
+
+def extra(data):
+    add_circles(data['image_scene'], data['camera'], data['extra_amount'])
+
+
+def overlay(data):
+    """The circles only depend on the extra amount and time, so they are rendered once and composited over the slide"""
+    def render(scene, camera, render_data):
+        add_circles(scene, camera, render_data['extra_amount'])
+    return {'render': render, 'key': ['Overlay Curves Right', round(data['extra_amount'], 3)]}
@@ -1,12 +1,27 @@
 import bpy
+import _extra_tools as tools
 from math import pi
 
 
+metadata = {
+    'uses_texture': False,
+    'animated': False,
+    'needs_shadows': True,
+    'cost': 1.2
+}
+
+
+def build_border_material(name):
+    border_material = bpy.data.materials.new(name)
+    border_material.diffuse_color = (0, 0, 0, 1)
+    border_material.specular_intensity = 0
+    return border_material
+
+
 def extra(data):
     image_scene = data['image_scene']
     image_plane = data['image_plane']
     extra_amount = data['extra_amount']
-    bpy.context.window.scene = image_scene
 
     aspect_ratio = image_plane.dimensions[0] / image_plane.dimensions[1]
     if aspect_ratio < 1:
@@ -22,32 +37,9 @@ def extra(data):
     width = width * base_size
     height = height * base_size
     position = 0.5 + (extra_amount / 2.5)
-    bpy.ops.mesh.primitive_circle_add(vertices=4, radius=0.46, location=(0, 0, position), rotation=(0, 0, pi/4), enter_editmode=True)
-    bpy.ops.transform.resize(value=(width, height, 1))
-    bpy.ops.mesh.extrude_region()
-    bpy.ops.transform.resize(value=(1.1, 1.1, 1.1))
-    bpy.ops.mesh.flip_normals()
-    bpy.ops.object.mode_set(mode='OBJECT')
-    frame = bpy.context.active_object
-    frame.parent = image_plane
-
-    bpy.ops.mesh.primitive_circle_add(vertices=4, radius=0.48, location=(0, 0, (position - 0.01)), rotation=(0, 0, pi/4), enter_editmode=True)
-    bpy.ops.transform.resize(value=(width, height, 1))
-    bpy.ops.mesh.extrude_region()
-    bpy.ops.transform.resize(value=(4, 4, 4))
-    bpy.ops.mesh.flip_normals()
-    bpy.ops.object.mode_set(mode='OBJECT')
-    border = bpy.context.active_object
-    border.parent = image_plane
-
-    bpy.ops.object.light_add(type='POINT', location=(0, 0, 1))
-    lamp = bpy.context.active_object
-    lamp.parent = image_plane
-
-    frame_material = bpy.data.materials.new('Frame')
-    frame.data.materials.append(frame_material)
-
-    border_material = bpy.data.materials.new('Border')
-    border.data.materials.append(border_material)
-    border_material.diffuse_color = (0, 0, 0, 1)
-    border_material.specular_intensity = 0
+    frame = tools.add_ring(image_scene, 'Frame', vertices=4, radius=0.46, outer_scale=1.1, size=(width, height), angle=pi/4, location=(0, 0, position), parent=image_plane)
+    border = tools.add_ring(image_scene, 'Border', vertices=4, radius=0.48, outer_scale=4, size=(width, height), angle=pi/4, location=(0, 0, (position - 0.01)), parent=image_plane)
+    tools.add_light(image_scene, 'Frame Lamp', 'POINT', location=(0, 0, 1), parent=image_plane)
+
+    frame.data.materials.append(tools.get_asset('materials', 'Frame', bpy.data.materials.new))
+    border.data.materials.append(tools.get_asset('materials', 'Border', build_border_material))
@@ -1,37 +1,26 @@
 import bpy
+import _extra_tools as tools
+
+
+metadata = {
+    'uses_texture': True,
+    'animated': True,
+    'needs_shadows': False,
+    'cost': 2.0
+}
 
 
 def extra(data):
     image_scene = data['image_scene']
     camera = data['camera']
     extra_texture = data['extra_texture']
-    bpy.context.window.scene = image_scene
 
     name = 'Video Background'
     location = (0, 0, -2.93)
     fullwidth = 2.12
-    render = image_scene.render
-    aspect_ratio = (render.pixel_aspect_x * render.resolution_x) / (render.pixel_aspect_y * render.resolution_y)
-    if aspect_ratio < 1:
-        #taller
-        dimensions = ((aspect_ratio / 1) * fullwidth, fullwidth, 0)
-    else:
-        #wider
-        dimensions = (fullwidth, (1 / aspect_ratio) * fullwidth, 0)
-
-    bpy.ops.mesh.primitive_plane_add()
-    video = bpy.context.active_object
-    video.name = name
-    modifier = video.modifiers.new(name='', type='SUBSURF')
-    modifier.render_levels = 1
-    modifier.subdivision_type = 'SIMPLE'
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.uv.unwrap()
-    bpy.ops.object.mode_set(mode='OBJECT')
-    video.dimensions = dimensions
-    bpy.ops.object.transform_apply(scale=True)
-    video.location = location
-    video.parent = camera
+    width, height = tools.fit_dimensions(image_scene, fullwidth)
+    video = tools.add_plane(image_scene, name, width, height, location=location, parent=camera)
+    tools.add_subsurf(video)
     material = bpy.data.materials.new(name)
     video.data.materials.append(material)
     material.use_nodes = True
@@ -47,6 +36,5 @@ def extra(data):
 
     if extra_texture is not None:
         texture.image = extra_texture
-        texture.image.update()
-        texture.image_user.frame_duration = texture.image.frame_duration
+        texture.image_user.frame_duration = tools.image_frame_count(extra_texture)
         texture.image_user.frame_offset = 0
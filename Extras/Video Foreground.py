@@ -1,4 +1,13 @@
 import bpy
+import _extra_tools as tools
+
+
+metadata = {
+    'uses_texture': True,
+    'animated': True,
+    'needs_shadows': False,
+    'cost': 2.0
+}
 
 
 def extra(data):
@@ -6,33 +15,13 @@ def extra(data):
     camera = data['camera']
     extra_texture = data['extra_texture']
     extra_amount = data['extra_amount']
-    bpy.context.window.scene = image_scene
 
     name = 'Video Foreground'
     location = (0, 0, -0.93)
     fullwidth = .675
-    render = image_scene.render
-    aspect_ratio = (render.pixel_aspect_x * render.resolution_x) / (render.pixel_aspect_y * render.resolution_y)
-    if aspect_ratio < 1:
-        #taller
-        dimensions = ((aspect_ratio / 1) * fullwidth, fullwidth, 0)
-    else:
-        #wider
-        dimensions = (fullwidth, (1 / aspect_ratio) * fullwidth, 0)
-
-    bpy.ops.mesh.primitive_plane_add()
-    video = bpy.context.active_object
-    video.name = name
-    modifier = video.modifiers.new(name='', type='SUBSURF')
-    modifier.render_levels = 1
-    modifier.subdivision_type = 'SIMPLE'
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.uv.unwrap()
-    bpy.ops.object.mode_set(mode='OBJECT')
-    video.dimensions = dimensions
-    bpy.ops.object.transform_apply(scale=True)
-    video.location = location
-    video.parent = camera
+    width, height = tools.fit_dimensions(image_scene, fullwidth)
+    video = tools.add_plane(image_scene, name, width, height, location=location, parent=camera)
+    tools.add_subsurf(video)
     material = bpy.data.materials.new(name)
     video.data.materials.append(material)
     material.use_nodes = True
@@ -54,6 +43,19 @@ def extra(data):
 
     if extra_texture is not None:
         texture.image = extra_texture
-        texture.image.update()
-        texture.image_user.frame_duration = texture.image.frame_duration
+        texture.image_user.frame_duration = tools.image_frame_count(extra_texture)
         texture.image_user.frame_offset = 0
+
+
+def overlay(data):
+    """The video covers the whole view, so it is shown as a strip over the slide instead of a blended plane"""
+    extra_texture = data['extra_texture']
+    if extra_texture is None:
+        return None
+    filepath = bpy.path.abspath(extra_texture.filepath)
+    if extra_texture.source == 'SEQUENCE':
+        directory, files = tools.sequence_files(extra_texture)
+        return {'directory': directory, 'files': files, 'opacity': data['extra_amount'], 'fit_method': 'FILL'}
+    if extra_texture.source == 'MOVIE':
+        return {'movie': filepath, 'opacity': data['extra_amount'], 'fit_method': 'FILL'}
+    return {'image': filepath, 'opacity': data['extra_amount'], 'fit_method': 'FILL'}
@@ -1,62 +1,81 @@
 import bpy
+import numpy as np
+import _extra_tools as tools
+
+
+metadata = {
+    'uses_texture': False,
+    'animated': False,
+    'needs_shadows': False,
+    'cost': 1.0
+}
+
+
+def vignette_mesh(width, height, extra_amount):
+    def build_material(name):
+        material = bpy.data.materials.new(name)
+        material.use_nodes = True
+        material.blend_method = 'BLEND'
+        node_tree = material.node_tree
+        nodes = node_tree.nodes
+        nodes.clear()
+        output = nodes.new('ShaderNodeOutputMaterial')
+        mix = nodes.new('ShaderNodeMixShader')
+        emission = nodes.new('ShaderNodeEmission')
+        emission.inputs[0].default_value = (0, 0, 0, 1)
+        transparent = nodes.new('ShaderNodeBsdfTransparent')
+        add = nodes.new('ShaderNodeMath')
+        add.operation = 'ADD'
+        add.use_clamp = True
+        add.inputs[1].default_value = -0.5 + (1 - extra_amount)
+        texture = nodes.new('ShaderNodeTexGradient')
+        texture.gradient_type = 'QUADRATIC_SPHERE'
+        mapping = nodes.new('ShaderNodeMapping')
+        mapping.inputs['Location'].default_value = (-0.5, -0.5, 0)
+        coords = nodes.new('ShaderNodeTexCoord')
+        node_tree.links.new(coords.outputs['UV'], mapping.inputs[0])
+        node_tree.links.new(mapping.outputs[0], texture.inputs[0])
+        node_tree.links.new(texture.outputs[0], add.inputs[0])
+        node_tree.links.new(add.outputs[0], mix.inputs[0])
+        node_tree.links.new(emission.outputs[0], mix.inputs[1])
+        node_tree.links.new(transparent.outputs[0], mix.inputs[2])
+        node_tree.links.new(mix.outputs[0], output.inputs[0])
+        return material
+
+    def build(name):
+        mesh = tools.plane_mesh(name, width, height)
+        mesh.materials.append(tools.get_asset('materials', 'Vignette '+str(round(extra_amount, 3)), build_material))
+        return mesh
+    return tools.get_asset('meshes', 'Vignette '+str(round(width, 4))+'x'+str(round(height, 4))+' '+str(round(extra_amount, 3)), build)
 
 
 def extra(data):
     image_scene = data['image_scene']
     camera = data['camera']
     extra_amount = data['extra_amount']
-    bpy.context.window.scene = image_scene
 
     name = 'Vignette'
     location = (0, 0, -0.93)
-    render = image_scene.render
-    aspect_ratio = (render.pixel_aspect_x * render.resolution_x) / (render.pixel_aspect_y * render.resolution_y)
-    if aspect_ratio < 1:
-        #taller
-        dimensions = (aspect_ratio / 1, 1, 0)
-    else:
-        #wider
-        dimensions = (1, 1 / aspect_ratio, 0)
-
-    bpy.ops.mesh.primitive_plane_add(size=1, location=(0, 0, 0))
-    vignette = bpy.context.active_object
-    vignette.name = name
-    modifier = vignette.modifiers.new(name='', type='SUBSURF')
-    modifier.render_levels = 1
-    modifier.subdivision_type = 'SIMPLE'
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.uv.unwrap()
-    bpy.ops.object.mode_set(mode='OBJECT')
-    vignette.dimensions = dimensions
-    bpy.ops.object.transform_apply(scale=True)
-    vignette.location = location
-    material = bpy.data.materials.new(name)
-    vignette.data.materials.append(material)
-    vignette.parent = camera
-    material.use_nodes = True
-    material.blend_method = 'BLEND'
-    node_tree = material.node_tree
-    nodes = node_tree.nodes
-    nodes.clear()
-    output = nodes.new('ShaderNodeOutputMaterial')
-    mix = nodes.new('ShaderNodeMixShader')
-    emission = nodes.new('ShaderNodeEmission')
-    emission.inputs[0].default_value = (0, 0, 0, 1)
-    transparent = nodes.new('ShaderNodeBsdfTransparent')
-    add = nodes.new('ShaderNodeMath')
-    add.operation = 'ADD'
-    add.use_clamp = True
-    add.inputs[1].default_value = -0.5 + (1 - extra_amount)
-    texture = nodes.new('ShaderNodeTexGradient')
-    texture.gradient_type = 'QUADRATIC_SPHERE'
-    mapping = nodes.new('ShaderNodeMapping')
-    mapping.inputs['Location'].default_value = (-0.5, -0.5, 0)
-    coords = nodes.new('ShaderNodeTexCoord')
-    node_tree.links.new(coords.outputs['UV'], mapping.inputs[0])
-    node_tree.links.new(mapping.outputs[0], texture.inputs[0])
-    node_tree.links.new(texture.outputs[0], add.inputs[0])
-    node_tree.links.new(add.outputs[0], mix.inputs[0])
-    node_tree.links.new(emission.outputs[0], mix.inputs[1])
-    node_tree.links.new(transparent.outputs[0], mix.inputs[2])
-    node_tree.links.new(mix.outputs[0], output.inputs[0])
+    width, height = tools.fit_dimensions(image_scene, 1)
+    vignette = tools.add_object(image_scene, name, vignette_mesh(width, height, extra_amount), location=location, parent=camera)
+    tools.add_subsurf(vignette)
+
+
+def overlay(data):
+    """The vignette is a still image, made once per resolution and amount with the same falloff as the material"""
+    extra_amount = data['extra_amount']
+    width, height = data['resolution']
 
+    def make_pixels():
+        #the plane is larger than the view and matches its aspect, the camera sees this much of its uv range at the plane distance
+        visible = 0.93 * 36 / 50
+        x = ((np.arange(width) + 0.5) / width - 0.5) * visible
+        y = ((np.arange(height) + 0.5) / height - 0.5) * visible
+        x, y = np.meshgrid(x, y)
+        gradient = np.maximum(0.999999 - np.sqrt((x * x) + (y * y)), 0) ** 2
+        factor = np.clip(gradient - 0.5 + (1 - extra_amount), 0, 1)
+        pixels = np.zeros((height, width, 4), dtype=np.float32)
+        pixels[..., 3] = 1 - factor
+        return pixels
+    image = tools.cached_array_image(data['cache_directory'], 'vignette', [width, height, round(extra_amount, 3)], make_pixels)
+    return {'image': bpy.path.abspath(image.filepath), 'fit_method': 'FILL'}
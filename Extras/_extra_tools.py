@@ -0,0 +1,337 @@
+import bpy
+import math
+import os
+import hashlib
+import numpy as np
+
+
+#Helpers for extras that build objects directly in bpy.data.
+#These do not use operators or the active scene, so they work without a window and do not trigger view layer updates.
+#Files starting with an underscore are not listed as extras.
+
+default_light_energy = {'SUN': 1.0, 'POINT': 1000.0, 'SPOT': 1000.0, 'AREA': 1000.0}
+
+#The generator passes in its own helpers when it loads an extra, so the addon and extras share one implementation:
+#get_shared_datablock(collection_name, key, build) and aspect_ratio(scene)
+get_shared_datablock = None
+aspect_ratio = None
+
+
+def get_asset(collection_name, key, build):
+    """Returns a datablock shared by every slide that asks for the same key, so it is only built once.
+    collection_name is the bpy.data collection, such as 'materials', 'meshes' or 'node_groups'.
+    build is called with a name the first time and must return the new datablock.
+    The key should include every setting the datablock depends on, eg: 'Plain Background 0.5'.
+    Shared assets are never removed with a slide, they are removed after a build once nothing uses them."""
+    return get_shared_datablock(collection_name, 'Extra '+key, build)
+
+
+def blend_path(script_file):
+    """Returns the path of the .blend file with the same name as an extra script, pass in __file__"""
+    return os.path.splitext(script_file)[0]+'.blend'
+
+
+def load_asset(script_file, collection_name, name):
+    """Returns a datablock appended from the .blend file next to an extra script, it is only appended once and shared like get_asset"""
+    def build(key):
+        with bpy.data.libraries.load(blend_path(script_file), link=False) as (data_from, data_to):
+            setattr(data_to, collection_name, [name])
+        datablock = getattr(data_to, collection_name)[0]
+        datablock.name = key
+        return datablock
+    return get_asset(collection_name, os.path.split(blend_path(script_file))[1]+' '+name, build)
+
+
+def link_object(scene, new_object, location=(0, 0, 0), rotation=(0, 0, 0), parent=None):
+    """Link an object to a scene, place it and parent it, returns the object"""
+    scene.collection.objects.link(new_object)
+    new_object.location = location
+    new_object.rotation_euler = rotation
+    if parent is not None:
+        new_object.parent = parent
+    return new_object
+
+
+def new_mesh(name, verts, faces, uvs=None):
+    """Create a mesh from vertex and face lists.
+    uvs is an optional list with one (u, v) per vertex, written to a uv map called 'UVMap'"""
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(verts, [], faces)
+    if uvs is not None:
+        uv_layer = mesh.uv_layers.new(name='UVMap')
+        for loop in mesh.loops:
+            uv_layer.data[loop.index].uv = uvs[loop.vertex_index]
+    mesh.update()
+    return mesh
+
+
+def plane_mesh(name, width=2.0, height=2.0):
+    """Create a plane mesh facing positive z, centered on its origin, with uvs covering the full 0-1 range"""
+    half_width = width / 2
+    half_height = height / 2
+    verts = [(-half_width, -half_height, 0), (half_width, -half_height, 0), (half_width, half_height, 0), (-half_width, half_height, 0)]
+    uvs = [(0, 0), (1, 0), (1, 1), (0, 1)]
+    return new_mesh(name, verts, [(0, 1, 2, 3)], uvs)
+
+
+def ring_mesh(name, vertices=32, radius=1.0, outer_scale=2.0, size=(1.0, 1.0), angle=0.0):
+    """Create a flat ring mesh facing positive z, made of a circle of vertices and a copy of it scaled by outer_scale.
+    size stretches the ring on x and y, angle rotates the first vertex around z, so vertices=4 and angle=pi/4 gives a rectangle frame"""
+    inner = []
+    for index in range(vertices):
+        vertex_angle = angle + (2 * math.pi * index / vertices)
+        inner.append((math.cos(vertex_angle) * radius * size[0], math.sin(vertex_angle) * radius * size[1], 0))
+    outer = [(x * outer_scale, y * outer_scale, z) for x, y, z in inner]
+    faces = []
+    for index in range(vertices):
+        next_index = (index + 1) % vertices
+        faces.append((index, vertices + index, vertices + next_index, next_index))
+    return new_mesh(name, inner + outer, faces)
+
+
+def add_object(scene, name, object_data, location=(0, 0, 0), rotation=(0, 0, 0), parent=None):
+    """Create an object using existing data, such as a mesh from get_asset, and link it to a scene"""
+    new_object = bpy.data.objects.new(name, object_data)
+    return link_object(scene, new_object, location, rotation, parent)
+
+
+def add_plane(scene, name, width=2.0, height=2.0, location=(0, 0, 0), rotation=(0, 0, 0), parent=None):
+    """Create a plane object with its own mesh, see plane_mesh"""
+    return add_object(scene, name, plane_mesh(name, width, height), location, rotation, parent)
+
+
+def add_ring(scene, name, vertices=32, radius=1.0, outer_scale=2.0, size=(1.0, 1.0), angle=0.0, location=(0, 0, 0), rotation=(0, 0, 0), parent=None):
+    """Create a ring object with its own mesh, see ring_mesh"""
+    return add_object(scene, name, ring_mesh(name, vertices, radius, outer_scale, size, angle), location, rotation, parent)
+
+
+def add_text(scene, name, body='Text', location=(0, 0, 0), rotation=(0, 0, 0), parent=None):
+    """Create a text object"""
+    curve = bpy.data.curves.new(name, type='FONT')
+    curve.body = body
+    new_object = bpy.data.objects.new(name, curve)
+    return link_object(scene, new_object, location, rotation, parent)
+
+
+def add_light(scene, name, light_type='POINT', energy=None, location=(0, 0, 0), rotation=(0, 0, 0), parent=None):
+    """Create a light, the energy defaults to the same value as adding a light in the viewport"""
+    light = bpy.data.lights.new(name, type=light_type)
+    if energy is None:
+        energy = default_light_energy.get(light_type, 1000.0)
+    light.energy = energy
+    new_object = bpy.data.objects.new(name, light)
+    return link_object(scene, new_object, location, rotation, parent)
+
+
+def add_subsurf(target_object, render_levels=1):
+    """Add a simple subdivision modifier, used so planes receive smooth lighting and shadows"""
+    modifier = target_object.modifiers.new(name='', type='SUBSURF')
+    modifier.render_levels = render_levels
+    modifier.subdivision_type = 'SIMPLE'
+    return modifier
+
+
+def duplicate_object(scene, source_object, name=None):
+    """Copy an object and its data into a scene, materials are shared with the original"""
+    new_object = source_object.copy()
+    if source_object.data is not None:
+        new_object.data = source_object.data.copy()
+    if name is not None:
+        new_object.name = name
+    scene.collection.objects.link(new_object)
+    return new_object
+
+
+def new_material(name, use_nodes=True):
+    """Create a material, with nodes it starts with a Principled BSDF connected to the output"""
+    material = bpy.data.materials.new(name)
+    material.use_nodes = use_nodes
+    return material
+
+
+def get_principled(material):
+    for node in material.node_tree.nodes:
+        if node.type == 'BSDF_PRINCIPLED':
+            return node
+    return None
+
+
+def fit_dimensions(scene, fullwidth):
+    """Returns the width and height of a rectangle with the aspect ratio of the scene, with the longest side being fullwidth"""
+    aspect = aspect_ratio(scene)
+    if aspect < 1:
+        #taller
+        return aspect * fullwidth, fullwidth
+    #wider
+    return fullwidth, (1 / aspect) * fullwidth
+
+
+def image_frame_count(image):
+    """Returns the number of frames of a movie or image sequence, using the count stored when the texture was transcoded"""
+    if 'snu_frame_count' in image:
+        return image['snu_frame_count']
+    image.update()
+    return image.frame_duration
+
+
+def sequence_files(image):
+    """Returns the directory and sorted file names of a transcoded image sequence"""
+    directory, first_file = os.path.split(bpy.path.abspath(image.filepath))
+    extension = os.path.splitext(first_file)[1]
+    files = sorted(file for file in os.listdir(directory) if file.endswith(extension))
+    return directory, files
+
+
+def cache_path(cache_directory, name, key_parts, extension='.png'):
+    """Returns a path in the cache directory named by name and a hash of key_parts, a list of everything the file depends on"""
+    key = hashlib.sha1(repr(key_parts).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_directory, name+'-'+key+extension)
+
+
+def image_signature(image):
+    """Returns a list identifying the current state of an image file, for use in cache_path key_parts"""
+    filepath = bpy.path.abspath(image.filepath)
+    if os.path.isfile(filepath):
+        stat = os.stat(filepath)
+        return [filepath, stat.st_mtime, stat.st_size]
+    return [image.name, image.size[0], image.size[1]]
+
+
+def image_to_array(image, max_size=None):
+    """Returns the pixels of an image as a float32 numpy array of shape (height, width, 4).
+    If max_size is given, a scaled down copy of the image is read instead, the original is left unchanged."""
+    width, height = image.size
+    source = image
+    if max_size is not None and max(width, height) > max_size:
+        scale = max_size / max(width, height)
+        width = max(1, int(round(width * scale)))
+        height = max(1, int(round(height * scale)))
+        source = image.copy()
+        source.scale(width, height)
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    source.pixels.foreach_get(pixels)
+    if source != image:
+        bpy.data.images.remove(source)
+    return pixels.reshape(height, width, 4)
+
+
+def save_array(pixels, filepath):
+    """Save a (height, width, 4) float array as a png and return it loaded as a Blender image"""
+    height, width = pixels.shape[:2]
+    name = os.path.split(filepath)[1]
+    image = bpy.data.images.new(name, width, height, alpha=True)
+    image.pixels.foreach_set(np.ascontiguousarray(pixels, dtype=np.float32).ravel())
+    image.filepath_raw = filepath
+    image.file_format = 'PNG'
+    image.save()
+    bpy.data.images.remove(image)
+    return bpy.data.images.load(filepath, check_existing=True)
+
+
+def gaussian_blur(pixels, sigma):
+    """Blur a (height, width, channels) array with a separable gaussian, edges are extended"""
+    if sigma <= 0:
+        return pixels
+    radius = max(1, int(math.ceil(sigma * 3)))
+    offsets = np.arange(-radius, radius + 1)
+    weights = np.exp(-(offsets ** 2) / (2 * sigma * sigma))
+    weights = weights / weights.sum()
+    for axis in (0, 1):
+        pad = [(0, 0)] * pixels.ndim
+        pad[axis] = (radius, radius)
+        padded = np.pad(pixels, pad, mode='edge')
+        length = pixels.shape[axis]
+        blurred = np.zeros_like(pixels)
+        for offset, weight in zip(offsets, weights):
+            blurred += weight * np.take(padded, np.arange(radius + offset, radius + offset + length), axis=axis)
+        pixels = blurred
+    return pixels
+
+
+def blurred_image(image, amount, cache_directory, max_size=256):
+    """Returns a small, blurred copy of an image, saved in the cache directory so it is only made once per image and amount.
+    amount is 0 to 1, the blur radius grows with it."""
+    filepath = cache_path(cache_directory, 'blur', image_signature(image) + [round(amount, 3), max_size])
+    if os.path.isfile(filepath):
+        return bpy.data.images.load(filepath, check_existing=True)
+    pixels = image_to_array(image, max_size)
+    sigma = max(pixels.shape[:2]) * (0.01 + (amount * 0.04))
+    return save_array(gaussian_blur(pixels, sigma), filepath)
+
+
+def voronoi_distance(size, scale, seed=0):
+    """Returns a (size, size) array of the distance from each pixel to the nearest random feature point,
+    with scale cells across the image, like the Distance output of the Voronoi texture node"""
+    random = np.random.default_rng(seed)
+    cells = int(scale)
+    points = random.random((cells + 2, cells + 2, 2))
+    coords = (np.arange(size) + 0.5) / size * cells
+    x, y = np.meshgrid(coords, coords)
+    cell_x = np.floor(x).astype(np.int32)
+    cell_y = np.floor(y).astype(np.int32)
+    distance = np.full((size, size), np.inf)
+    for offset_y in (-1, 0, 1):
+        for offset_x in (-1, 0, 1):
+            neighbor_x = cell_x + offset_x
+            neighbor_y = cell_y + offset_y
+            point = points[(neighbor_y + 1) % (cells + 2), (neighbor_x + 1) % (cells + 2)]
+            delta_x = neighbor_x + point[..., 0] - x
+            delta_y = neighbor_y + point[..., 1] - y
+            distance = np.minimum(distance, np.sqrt((delta_x * delta_x) + (delta_y * delta_y)))
+    return distance
+
+
+def value_noise(size, scale, detail=2, roughness=0.5, seed=0):
+    """Returns a (size, size) array of fractal noise between 0 and 1, similar to the Fac output of the Noise texture node"""
+    random = np.random.default_rng(seed)
+    result = np.zeros((size, size))
+    amplitude = 1.0
+    total = 0.0
+    frequency = scale
+    for octave in range(int(detail) + 1):
+        if frequency > size / 2:
+            #finer octaves can not be represented at this resolution
+            break
+        cells = int(math.ceil(frequency)) + 1
+        lattice = random.random((cells + 1, cells + 1))
+        coords = (np.arange(size) + 0.5) / size * frequency
+        cell = np.floor(coords).astype(np.int32)
+        fraction = coords - cell
+        fraction = fraction * fraction * (3 - (2 * fraction))
+        x0, y0 = np.meshgrid(cell, cell)
+        fx, fy = np.meshgrid(fraction, fraction)
+        top = (lattice[y0, x0] * (1 - fx)) + (lattice[y0, x0 + 1] * fx)
+        bottom = (lattice[y0 + 1, x0] * (1 - fx)) + (lattice[y0 + 1, x0 + 1] * fx)
+        result += amplitude * ((top * (1 - fy)) + (bottom * fy))
+        total += amplitude
+        amplitude *= roughness
+        frequency *= 2
+    return result / total
+
+
+def normal_map_from_height(height, world_size, strength=1.0, invert=False):
+    """Returns a (size, size, 4) tangent space normal map from a height array covering world_size blender units,
+    matching a Bump node with distance 1, so it can replace the bump with a Normal Map node"""
+    gradient_y, gradient_x = np.gradient(height, world_size / height.shape[0], world_size / height.shape[1])
+    if invert:
+        gradient_x = -gradient_x
+        gradient_y = -gradient_y
+    normal = np.dstack((-gradient_x, -gradient_y, np.ones_like(height)))
+    normal /= np.linalg.norm(normal, axis=2, keepdims=True)
+    normal = (normal * strength) + (np.array((0.0, 0.0, 1.0)) * (1 - strength))
+    normal /= np.linalg.norm(normal, axis=2, keepdims=True)
+    pixels = np.ones(height.shape + (4, ), dtype=np.float32)
+    pixels[..., :3] = (normal + 1) / 2
+    return pixels
+
+
+def cached_array_image(cache_directory, name, key_parts, make_pixels, non_color=False):
+    """Returns an image from the cache directory, make_pixels is only called to create it if it is not cached yet"""
+    filepath = cache_path(cache_directory, name, key_parts)
+    if os.path.isfile(filepath):
+        image = bpy.data.images.load(filepath, check_existing=True)
+    else:
+        image = save_array(make_pixels(), filepath)
+    if non_color:
+        image.colorspace_settings.name = 'Non-Color'
+    return image
@@ -17,6 +17,8 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
+import blf
+import aud
 import re
 from bpy.props import *
 
@@ -27,7 +29,13 @@ import sys
 import math
 from mathutils import Vector
 import json
+import hashlib
+import importlib
+import subprocess
+import time
+import numpy as np
 from bpy_extras.image_utils import load_image
+from bpy_extras.view3d_utils import location_3d_to_region_2d
 from bpy.app.handlers import persistent
 
 bl_info = {
@@ -42,6 +50,50 @@ bl_info = {
 }
 
 
+# Thumbnail atlas page and cell size in pixels, used for displaying the slides in the generator scene
+atlas_size = 2048
+atlas_cell_size = 256
+
+
+# Index of loaded images, normalized file path: image name
+image_index = {}
+image_index_state = {'file': None}
+shared_datablocks = {}
+extra_modules = {}
+worker_built_scenes = set()
+extra_metadata_defaults = {
+    'uses_texture': True,
+    'animated': True,
+    'needs_shadows': True,
+    'cost': 1.0,
+    'prepare': None
+}
+no_extra_metadata = {
+    'uses_texture': False,
+    'animated': False,
+    'needs_shadows': False,
+    'cost': 0.5
+}
+
+# Datablock types that may be created for a slide, and the bpy.data collection they are found in
+id_type_collections = {
+    'ACTION': 'actions',
+    'CAMERA': 'cameras',
+    'CURVE': 'curves',
+    'IMAGE': 'images',
+    'LIGHT': 'lights',
+    'MATERIAL': 'materials',
+    'MESH': 'meshes',
+    'NODETREE': 'node_groups',
+    'OBJECT': 'objects',
+    'SCENE': 'scenes',
+    'WORLD': 'worlds'
+}
+
+# Datablock collections a build worker copies from the source file, tagged so the originals can be used again after appending
+worker_source_collections = sorted(set(id_type_collections.values()) | {'collections', 'fonts', 'textures'})
+
+
 # Transform definitions
 transforms = [
     {
@@ -142,6 +194,20 @@ transforms = [
 ]
 
 
+# Transform definition channels: definition key, fcurve data path, fcurve index
+transform_channels = [
+    ('zLoc', 'location', 2),
+    ('zRot', 'rotation_euler', 2),
+    ('xLoc', 'location', 0),
+    ('influence', 'constraints[0].influence', 0)
+]
+compiled_transforms = {}
+
+# Internal enum values of keyframe settings, used when writing keyframes with foreach_set
+keyframe_interpolations = {'CONSTANT': 0, 'LINEAR': 1, 'BEZIER': 2}
+keyframe_handle_types = {'FREE': 0, 'AUTO': 1, 'VECTOR': 2, 'ALIGNED': 3, 'AUTO_CLAMPED': 4}
+
+
 def get_extensions_image():
     return list(bpy.path.extensions_image) + [x.upper() for x in list(bpy.path.extensions_image)]
 
@@ -150,10 +216,186 @@ def get_extensions_video():
     return list(bpy.path.extensions_movie) + [x.upper() for x in list(bpy.path.extensions_movie)]
 
 
+def normalize_path(filepath):
+    return os.path.normcase(os.path.realpath(bpy.path.abspath(filepath)))
+
+
+def index_image(image):
+    """Add a loaded or re-pathed image to the index used by get_image"""
+    if image is not None and image.filepath:
+        image_index[normalize_path(image.filepath)] = image.name
+    return image
+
+
 def get_image(filepath):
-    for image in bpy.data.images:
-        if image.filepath == filepath:
-            return image
+    """Find an already loaded image by its file path, using an index of normalized paths to image names.
+    The index is built once per blend file, images loaded after that are added with index_image."""
+    if image_index_state['file'] != bpy.data.filepath:
+        image_index.clear()
+        for image in bpy.data.images:
+            index_image(image)
+        image_index_state['file'] = bpy.data.filepath
+    key = normalize_path(filepath)
+    name = image_index.get(key)
+    if name is None:
+        return None
+    image = bpy.data.images.get(name)
+    if image is not None and normalize_path(image.filepath) == key:
+        return image
+    # The image was removed, renamed or given another file
+    del image_index[key]
+    return None
+
+
+def own_data(slide, datablock, group):
+    """Record a datablock as created for a slide, so it can be removed when the slide is rebuilt or deleted.
+    The group is used to remove only the datablocks of one part of the slide, such as 'scene' or 'text'."""
+    if datablock is None or datablock.id_type not in id_type_collections:
+        return
+    datablock['snu_slide_owner'] = slide.name
+    owned = slide.slideshow.owned_data.add()
+    owned.name = datablock.name
+    owned.id_type = datablock.id_type
+    owned.group = group
+
+
+def is_unshared(datablock):
+    return datablock is not None and datablock.users == 1 and 'snu_shared_key' not in datablock
+
+
+def get_shared_datablock(collection_name, key, build):
+    """Returns the datablock shared by every slide scene with the same settings key, build is called with a name to create it the first time"""
+    collection = getattr(bpy.data, collection_name)
+    name = shared_datablocks.get((collection_name, key))
+    if name is not None:
+        datablock = collection.get(name)
+        if datablock is not None and datablock.get('snu_shared_key') == key:
+            return datablock
+    for datablock in collection:
+        if datablock.get('snu_shared_key') == key:
+            break
+    else:
+        datablock = build('Slideshow '+key)
+        datablock['snu_shared_key'] = key
+    shared_datablocks[(collection_name, key)] = datablock.name
+    return datablock
+
+
+def purge_unused_shared_data():
+    """Remove shared datablocks, including the assets of extras, that no slide uses any more.
+    Removing a shared mesh can leave its shared material unused, so this repeats until nothing is removed."""
+    while True:
+        unused = []
+        for collection_name in set(id_type_collections.values()):
+            for datablock in getattr(bpy.data, collection_name):
+                if 'snu_shared_key' in datablock and datablock.users == 0:
+                    unused.append(datablock)
+        if not unused:
+            return
+        bpy.data.batch_remove(unused)
+
+
+def shared_black_world():
+    def build(name):
+        world = bpy.data.worlds.new(name)
+        world.use_nodes = False
+        world.color = (0, 0, 0)
+        return world
+    return get_shared_datablock('worlds', 'Black World', build)
+
+
+def shared_transparent_world():
+    def build(name):
+        world = bpy.data.worlds.new(name)
+        world.use_nodes = True
+        world.node_tree.nodes.clear()
+        output_node = world.node_tree.nodes.new('ShaderNodeOutputWorld')
+        transparent_node = world.node_tree.nodes.new('ShaderNodeBackground')
+        transparent_node.inputs[0].default_value = (0, 0, 0, 0)
+        transparent_node.inputs[1].default_value = 0
+        world.node_tree.links.new(transparent_node.outputs[0], output_node.inputs[0])
+        return world
+    return get_shared_datablock('worlds', 'Transparent World', build)
+
+
+def shared_camera_data(clip_start=0.1, clip_end=1000.0):
+    """Camera data with depth of field off, extras that change the camera must give it a copy of this first"""
+    def build(name):
+        camera = bpy.data.cameras.new(name)
+        camera.dof.use_dof = False
+        camera.clip_start = clip_start
+        camera.clip_end = clip_end
+        return camera
+    return get_shared_datablock('cameras', 'Camera '+str(clip_start)+'-'+str(clip_end), build)
+
+
+def shared_text_material(name, emission_name, color, strength):
+    """Emission material for overlay text, faded by the snu_text_alpha property of each object using it"""
+    def build(name):
+        material = bpy.data.materials.new(name)
+        material.use_nodes = True
+        material.surface_render_method = 'BLENDED'
+        nodes = material.node_tree.nodes
+        links = material.node_tree.links
+        nodes.clear()
+        alpha = nodes.new('ShaderNodeAttribute')
+        alpha.attribute_type = 'OBJECT'
+        alpha.attribute_name = 'snu_text_alpha'
+        transparent = nodes.new('ShaderNodeBsdfTransparent')
+        emission = nodes.new('ShaderNodeEmission')
+        emission.name = emission_name
+        emission.inputs[0].default_value = color
+        emission.inputs[1].default_value = strength
+        mix = nodes.new('ShaderNodeMixShader')
+        output = nodes.new('ShaderNodeOutputMaterial')
+        links.new(alpha.outputs['Fac'], mix.inputs[0])
+        links.new(transparent.outputs[0], mix.inputs[1])
+        links.new(emission.outputs[0], mix.inputs[2])
+        links.new(mix.outputs[0], output.inputs[0])
+        return material
+    return get_shared_datablock('materials', name, build)
+
+
+def own_scene_data(slide, scene, skip_objects, group):
+    """Record a scene and everything created in it for a slide: objects, their data, materials and actions, and the world"""
+    own_data(slide, scene, group)
+    if is_unshared(scene.world):
+        own_data(slide, scene.world, group)
+    for scene_object in scene.objects:
+        if scene_object in skip_objects:
+            continue
+        own_data(slide, scene_object, group)
+        if is_unshared(scene_object.data):
+            own_data(slide, scene_object.data, group)
+        for slot in scene_object.material_slots:
+            if is_unshared(slot.material):
+                own_data(slide, slot.material, group)
+        if scene_object.animation_data and is_unshared(scene_object.animation_data.action):
+            own_data(slide, scene_object.animation_data.action, group)
+
+
+def purge_owned_data(slide, group=None):
+    """Remove the datablocks that were recorded as created for a slide, only those of the given group if one is given"""
+    datablocks = []
+    remaining = []
+    for owned in slide.slideshow.owned_data:
+        if group is not None and owned.group != group:
+            remaining.append((owned.name, owned.id_type, owned.group))
+            continue
+        collection = getattr(bpy.data, id_type_collections.get(owned.id_type, ''), None)
+        if collection is None:
+            continue
+        datablock = collection.get(owned.name)
+        if datablock is not None and datablock.get('snu_slide_owner') == slide.name and datablock not in datablocks:
+            datablocks.append(datablock)
+    slide.slideshow.owned_data.clear()
+    for name, id_type, owned_group in remaining:
+        owned = slide.slideshow.owned_data.add()
+        owned.name = name
+        owned.id_type = id_type
+        owned.group = owned_group
+    if datablocks:
+        bpy.data.batch_remove(datablocks)
 
 
 def update_scene(scene):
@@ -177,8 +419,10 @@ def is_generator_scene(scene):
 
 
 @persistent
-def slideshow_autoupdate(_):
+def slideshow_autoupdate(_, depsgraph=None):
     if is_generator_scene(bpy.context.scene):
+        if depsgraph is not None:
+            clamp_transformed_objects(bpy.context.scene, depsgraph)
         update_order()
         lock_view()
 
@@ -203,41 +447,53 @@ def get_fps(scene):
     return scene.render.fps / scene.render.fps_base
 
 
-def sanitize_text_for_driver(text):
-    """Sanitize text content to be safe for use in driver expressions"""
-    # Escape quotes and special characters
-    text = text.replace('\\', '\\\\')  # Escape backslashes first
-    text = text.replace('"', '\\"')    # Escape double quotes
-    text = text.replace('\n', '\\n')   # Escape newlines
-    text = text.replace('\r', '\\r')   # Escape carriage returns
-    text = text.replace('\t', '\\t')   # Escape tabs
-    return text
+def render_setting_structs(scene):
+    render = scene.render
+    return {
+        'render': render,
+        'image_settings': render.image_settings,
+        'ffmpeg': render.ffmpeg
+    }
 
-def create_scene(oldscene, scenename):
-    newscene = bpy.data.scenes.new(scenename)
 
-    # Copy render settings
-    for prop in oldscene.render.bl_rna.properties:
-        if not prop.is_readonly:
-            value = eval('oldscene.render.'+prop.identifier)
+def snapshot_render_settings(scene):
+    """Read the writable render, image and ffmpeg settings of a scene into a dictionary that can be applied to new scenes"""
+    settings = {}
+    for group, struct in render_setting_structs(scene).items():
+        values = {}
+        for prop in struct.bl_rna.properties:
+            if prop.is_readonly:
+                continue
             try:
-                setattr(newscene.render, prop.identifier, value)
-            except Exception as e:
-                pass
-    for prop in oldscene.render.image_settings.bl_rna.properties:
-        if not prop.is_readonly:
-            value = eval('oldscene.render.image_settings.'+prop.identifier)
+                value = getattr(struct, prop.identifier)
+            except AttributeError:
+                continue
+            if getattr(prop, 'array_length', 0) > 0:
+                value = tuple(value)
+            values[prop.identifier] = value
+        settings[group] = values
+    return settings
+
+
+def apply_render_settings(scene, settings):
+    """Apply settings from snapshot_render_settings to a scene.
+    Settings that can not be set are dropped from the snapshot so following scenes do not try them again."""
+    for group, struct in render_setting_structs(scene).items():
+        values = settings[group]
+        for identifier, value in list(values.items()):
             try:
-                setattr(newscene.render.image_settings, prop.identifier, value)
-            except Exception as e:
-                pass
-    for prop in oldscene.render.ffmpeg.bl_rna.properties:
-        if not prop.is_readonly:
-            value = eval('oldscene.render.ffmpeg.'+prop.identifier)
-            try:
-                setattr(newscene.render.ffmpeg, prop.identifier, value)
-            except Exception as e:
-                pass
+                setattr(struct, identifier, value)
+            except Exception:
+                del values[identifier]
+
+
+def create_scene(oldscene, scenename, render_settings=None):
+    newscene = bpy.data.scenes.new(scenename)
+
+    # Copy render settings
+    if render_settings is None:
+        render_settings = snapshot_render_settings(oldscene)
+    apply_render_settings(newscene, render_settings)
 
     newscene.view_settings.view_transform = oldscene.view_settings.view_transform
 
@@ -257,6 +513,14 @@ def aspect_ratio(scene):
     return (render.pixel_aspect_x * render.resolution_x) / (render.pixel_aspect_y * render.resolution_y)
 
 
+text_overlay_fields = [
+    ('text_photographer', 'Photo by'),
+    ('text_when', 'When'),
+    ('text_who', 'Who'),
+    ('text_where', 'Where')
+]
+
+
 def get_text_location(generator_scene, y_offset, size=0.18):
     """Return correct (x, y, z) based on chosen alignment"""
     align = generator_scene.snu_slideshow_generator.text_alignment
@@ -317,140 +581,66 @@ def load_slide_text_data(image_filepath):
 
 @bpy.app.handlers.persistent
 def typewriter_frame_handler(scene):
-    """Frame handler for typewriter animation"""
-    
-    for obj in scene.objects:
-        if (obj.type == 'FONT' and 
-            "typewriter_full_text" in obj and 
-            "typewriter_start_frame" in obj and
-            not obj.data.animation_data):
-            
-            current_frame = scene.frame_current
-            start_frame = obj["typewriter_start_frame"]
-            frames_per_char = obj.get("typewriter_frames_per_char", 8)
-            full_text = obj["typewriter_full_text"]
-            
-            elapsed_frames = current_frame - start_frame
-            char_count = max(0, min(len(full_text), elapsed_frames // frames_per_char))
-            
-            obj.data.body = full_text[:int(char_count)]
+    """Frame handler for typewriter animation, only the text objects registered on the scene are updated"""
+    names = scene.get("snu_typewriter_objects")
+    if not names:
+        return
 
+    for name in names:
+        obj = scene.objects.get(name)
+        if obj is None or obj.type != 'FONT' or "typewriter_counts" not in obj:
+            continue
+        full_text = obj["typewriter_full_text"]
+        counts = obj["typewriter_counts"]
+        elapsed_frames = scene.frame_current - obj["typewriter_start_frame"]
+        if elapsed_frames < 0:
+            char_count = 0
+        elif elapsed_frames < len(counts):
+            char_count = counts[elapsed_frames]
+        else:
+            char_count = len(full_text)
+        body = full_text[:char_count]
+        if obj.data.body != body:
+            obj.data.body = body
 
-def add_typewriter_animation_frame_based(text_obj, full_text, scene):
-    """Fallback frame-based typewriter animation using frame handlers"""
-    
-    if text_obj.animation_data:
-        text_obj.animation_data_clear()
-    
-    text_obj["typewriter_full_text"] = full_text
-    text_obj["typewriter_start_frame"] = scene.frame_current
-    
-    fps = get_fps(scene)
-    chars_per_second = 8
-    frames_per_char = max(1, int(fps / chars_per_second))
-    text_obj["typewriter_frames_per_char"] = frames_per_char
-    text_obj["typewriter_total_frames"] = len(full_text) * frames_per_char
-    
-    if typewriter_frame_handler not in bpy.app.handlers.frame_change_pre:
-        bpy.app.handlers.frame_change_pre.append(typewriter_frame_handler)
 
+def add_typewriter_animation(text_obj, full_text, scene, start_frame=1):
+    """Precompute the typewriter animation of a text object as a table of character counts per frame.
+    The object is registered on the scene so typewriter_frame_handler plays it back, returns the length of the animation"""
 
-def add_typewriter_animation_robust(text_obj, full_text, scene, start_frame=1):
-    """Add robust typewriter animation using custom properties and drivers with start_frame support"""
-    
-    if not full_text.strip():
-        text_obj.data.body = ""
-        return
-    
     if text_obj.animation_data:
         text_obj.animation_data_clear()
-    
+
     if text_obj.data.animation_data:
         text_obj.data.animation_data.drivers.clear()
-    
-    sanitized_text = sanitize_text_for_driver(full_text)
-    text_obj["typewriter_full_text"] = full_text
-    text_obj["typewriter_sanitized_text"] = sanitized_text
-    
-    text_obj["typewriter_progress"] = 0.0
-    
-    try:
-        text_obj.id_properties_ui("typewriter_progress").update(
-            min=0.0,
-            max=float(len(full_text)),
-            soft_min=0.0,
-            soft_max=float(len(full_text)),
-            description="Controls typewriter effect progress"
-        )
-    except AttributeError:
-        pass
-    
-    text_obj.animation_data_create()
-    action = bpy.data.actions.new(name=f"{text_obj.name}_typewriter")
-    text_obj.animation_data.action = action
-    
+
+    text_obj.data.body = ""
+    if not full_text.strip():
+        return
+
     fps = get_fps(scene)
     chars_per_second = 8
     frames_per_char = max(1, int(fps / chars_per_second))
     total_frames = len(full_text) * frames_per_char
-    
-    fcurve = action.fcurves.new(data_path='["typewriter_progress"]')
-    
-    start_point = fcurve.keyframe_points.insert(frame=start_frame, value=0.0)
-    start_point.interpolation = 'LINEAR'
-    
-    end_frame = start_frame + total_frames
-    end_point = fcurve.keyframe_points.insert(frame=end_frame, value=float(len(full_text)))
-    end_point.interpolation = 'LINEAR'
-    
-    try:
-        driver = text_obj.data.driver_add("body")
-        driver.driver.type = 'SCRIPTED'
-        
-        var = driver.driver.variables.new()
-        var.name = "progress"
-        var.type = 'SINGLE_PROP'
-        var.targets[0].id = text_obj
-        var.targets[0].data_path = '["typewriter_progress"]'
-        
-        var_text = driver.driver.variables.new()
-        var_text.name = "full_text"
-        var_text.type = 'SINGLE_PROP'
-        var_text.targets[0].id = text_obj
-        var_text.targets[0].data_path = '["typewriter_full_text"]'
-        
-        driver.driver.expression = f"full_text[0:int(max(0, min(progress, len(full_text))))] if full_text else ''"
-        
-    except Exception as e:
-        print(f"Error creating driver for {text_obj.name}: {e}")
-        add_typewriter_animation_frame_based(text_obj, full_text, scene)
-        return
-    
-    scene.frame_set(1)
-    text_obj["typewriter_progress"] = 0.0
-    
-    return total_frames
 
+    text_obj["typewriter_full_text"] = full_text
+    text_obj["typewriter_start_frame"] = start_frame
+    text_obj["typewriter_counts"] = [frame // frames_per_char for frame in range(total_frames + 1)]
 
+    names = list(scene.get("snu_typewriter_objects", []))
+    if text_obj.name not in names:
+        names.append(text_obj.name)
+        scene["snu_typewriter_objects"] = names
 
+    return total_frames
 
 
 def add_animation_delay_robust(text_obj, delay_frames):
-    """Add a delay to the typewriter animation by shifting keyframes or adjusting start frame"""
-    
-    if text_obj.data.animation_data and text_obj.data.animation_data.action:
-        for fcurve in text_obj.data.animation_data.action.fcurves:
-            if fcurve.data_path == '["typewriter_progress"]':
-                for keyframe in fcurve.keyframe_points:
-                    keyframe.co[0] += delay_frames
-                    keyframe.handle_left[0] += delay_frames
-                    keyframe.handle_right[0] += delay_frames
-    elif "typewriter_start_frame" in text_obj:
+    """Add a delay to the typewriter animation by adjusting its start frame"""
+    if "typewriter_start_frame" in text_obj:
         text_obj["typewriter_start_frame"] += delay_frames
 
 
-
-
 def add_fade_animation(obj, material, scene, start_frame, duration=20):
     """Animate emission strength fade-out for text and outline."""
     if not material or not material.node_tree:
@@ -477,7 +667,7 @@ def add_fade_animation(obj, material, scene, start_frame, duration=20):
 
 
 
-def create_slide_text_overlay_scene_with_improved_outline(generator_scene, slide, slide_duration):
+def create_slide_text_overlay_scene_with_improved_outline(generator_scene, slide, slide_duration, render_settings=None):
     """Create a scene with improved outlined text overlays, including a synchronized fade-out animation"""
     
     if not slide.slideshow.enable_text_overlay:
@@ -499,7 +689,7 @@ def create_slide_text_overlay_scene_with_improved_outline(generator_scene, slide
     if bpy.data.scenes.find(text_scene_name) != -1:
         bpy.data.scenes.remove(bpy.data.scenes[text_scene_name])
     
-    text_scene = create_scene(generator_scene, text_scene_name)
+    text_scene = create_scene(generator_scene, text_scene_name, render_settings)
     fps = get_fps(text_scene)
     text_scene.frame_end = int(fps * slide_duration)
     
@@ -513,16 +703,7 @@ def create_slide_text_overlay_scene_with_improved_outline(generator_scene, slide
     except AttributeError:
         pass
     
-    world = bpy.data.worlds.new(text_scene.name)
-    text_scene.world = world
-    world.use_nodes = True
-    world.node_tree.nodes.clear()
-    
-    output_node = world.node_tree.nodes.new('ShaderNodeOutputWorld')
-    transparent_node = world.node_tree.nodes.new('ShaderNodeBackground')
-    transparent_node.inputs[0].default_value = (0, 0, 0, 0)
-    transparent_node.inputs[1].default_value = 0
-    world.node_tree.links.new(transparent_node.outputs[0], output_node.inputs[0])
+    text_scene.world = shared_transparent_world()
     
     text_alignment = generator_scene.snu_slideshow_generator.text_alignment
     
@@ -577,10 +758,8 @@ def create_slide_text_overlay_scene_with_improved_outline(generator_scene, slide
         for obj, material in materials_to_fade:
             add_fade_animation(obj, material, text_scene, start_frame=fade_start, duration=20)
     
-    camera = add_object(text_scene, f"{text_scene.name}_Camera", 'CAMERA')
+    camera = add_object(text_scene, f"{text_scene.name}_Camera", 'CAMERA', object_data=shared_camera_data(0.1, 100.0))
     camera.location = (0, 0, 5)
-    camera.data.clip_start = 0.1
-    camera.data.clip_end = 100.0
     text_scene.camera = camera
     
     return text_scene
@@ -662,6 +841,156 @@ def setup_material(material, image):
     return material_nodes
 
 
+def get_slide_material(image_plane):
+    """Returns the full resolution material of a slide, the plane itself may be showing a thumbnail atlas material"""
+    if len(image_plane.data.materials) > 0 and image_plane.data.materials[0] is not None:
+        return image_plane.data.materials[0]
+    return image_plane.material_slots[0].material
+
+
+def get_render_plane(image_plane, image_scene):
+    """Returns the image plane object to be used in a slide scene.
+    If the generator plane is showing the thumbnail atlas, a copy of it using the full resolution material is made."""
+    if image_plane.material_slots[0].link != 'OBJECT':
+        return image_plane
+    render_plane = image_plane.copy()
+    render_plane.name = image_scene.name+' Image'
+    render_plane.material_slots[0].link = 'DATA'
+    return render_plane
+
+
+def copy_plane_child(child, render_plane, name):
+    """Returns a copy of an object parented to the generator plane, parented to the render plane instead,
+    so the camera rig of a slide scene stays with its plane when the generator plane is moved"""
+    child_copy = child.copy()
+    child_copy.name = name
+    child_copy.parent = render_plane
+    child_copy.matrix_parent_inverse = child.matrix_parent_inverse.copy()
+    return child_copy
+
+
+def atlas_image(page):
+    name = 'Slideshow Thumbnails '+str(page)
+    image = bpy.data.images.get(name)
+    if image is None:
+        image = bpy.data.images.new(name, atlas_size, atlas_size)
+    return image
+
+
+def atlas_material(page):
+    name = 'Slideshow Thumbnails '+str(page)
+    material = bpy.data.materials.get(name)
+    if material is not None:
+        return material
+    material = bpy.data.materials.new(name)
+    material.use_nodes = True
+    tree = material.node_tree
+    nodes = tree.nodes
+    nodes.clear()
+
+    uv_map = nodes.new('ShaderNodeUVMap')
+    uv_map.uv_map = 'Atlas'
+    uv_map.location = (-600, 0)
+    texture = nodes.new('ShaderNodeTexImage')
+    texture.image = atlas_image(page)
+    texture.location = (-400, 0)
+    shadeless = nodes.new('ShaderNodeEmission')
+    shadeless.location = (0, 0)
+    output = nodes.new('ShaderNodeOutputMaterial')
+    output.location = (200, 0)
+
+    tree.links.new(uv_map.outputs[0], texture.inputs[0])
+    tree.links.new(texture.outputs[0], shadeless.inputs[0])
+    tree.links.new(shadeless.outputs[0], output.inputs[0])
+    return material
+
+
+def image_thumbnail(image):
+    """Returns a downscaled copy of the image pixels as an array of size (atlas_cell_size, atlas_cell_size, 4)"""
+    width, height = image.size
+    channels = image.channels
+    if width == 0 or height == 0 or channels == 0:
+        return None
+    pixels = np.empty(width * height * channels, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    pixels = pixels.reshape(height, width, channels)
+    rows = ((np.arange(atlas_cell_size) + 0.5) * height / atlas_cell_size).astype(int)
+    columns = ((np.arange(atlas_cell_size) + 0.5) * width / atlas_cell_size).astype(int)
+    sampled = pixels[rows[:, None], columns[None, :]]
+    thumbnail = np.ones((atlas_cell_size, atlas_cell_size, 4), dtype=np.float32)
+    if channels >= 3:
+        thumbnail[..., :3] = sampled[..., :3]
+    else:
+        thumbnail[..., :3] = sampled[..., :1]
+    return thumbnail
+
+
+def set_atlas_uvs(image_plane, page_cell):
+    """Fills the 'Atlas' uv layer of the plane with its regular uvs moved into its cell of the atlas page"""
+    mesh = image_plane.data
+    if 'Atlas' not in mesh.uv_layers:
+        mesh.uv_layers.new(name='Atlas', do_init=False)
+    mesh.uv_layers[0].active_render = True
+    uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+    mesh.uv_layers[0].data.foreach_get('uv', uvs)
+    cells_per_row = atlas_size // atlas_cell_size
+    row, column = divmod(page_cell, cells_per_row)
+    scale = atlas_cell_size / atlas_size
+    uvs[0::2] = (column + uvs[0::2]) * scale
+    uvs[1::2] = (row + uvs[1::2]) * scale
+    mesh.uv_layers['Atlas'].data.foreach_set('uv', uvs)
+
+
+def update_thumbnail_atlas(generator_scene):
+    """Packs thumbnails of image slides that are not in the atlas yet, and switches their planes to the shared atlas material.
+    Only atlas pages that receive new thumbnails are rewritten."""
+    slides = list_slides(generator_scene)
+    cells_per_row = atlas_size // atlas_cell_size
+    cells_per_page = cells_per_row * cells_per_row
+    used = set()
+    new_slides = []
+    for slide in slides:
+        if slide.slideshow.atlas_page >= 0:
+            used.add((slide.slideshow.atlas_page, slide.slideshow.atlas_cell))
+        elif not slide.slideshow.videofile:
+            new_slides.append(slide)
+    if not new_slides:
+        return
+
+    pages = {}
+    next_cell = 0
+    for slide in new_slides:
+        material_nodes = get_material_elements(get_slide_material(slide), slide.slideshow.name)
+        if material_nodes is None:
+            continue
+        thumbnail = image_thumbnail(material_nodes['texture'].image)
+        if thumbnail is None:
+            continue
+        while divmod(next_cell, cells_per_page) in used:
+            next_cell += 1
+        page, page_cell = divmod(next_cell, cells_per_page)
+        used.add((page, page_cell))
+        if page not in pages:
+            image = atlas_image(page)
+            pixels = np.empty(atlas_size * atlas_size * 4, dtype=np.float32)
+            image.pixels.foreach_get(pixels)
+            pages[page] = pixels.reshape(atlas_size, atlas_size, 4)
+        row, column = divmod(page_cell, cells_per_row)
+        pages[page][row * atlas_cell_size:(row + 1) * atlas_cell_size, column * atlas_cell_size:(column + 1) * atlas_cell_size] = thumbnail
+
+        slide.slideshow.atlas_page = page
+        slide.slideshow.atlas_cell = page_cell
+        set_atlas_uvs(slide, page_cell)
+        slide.material_slots[0].link = 'OBJECT'
+        slide.material_slots[0].material = atlas_material(page)
+
+    for page, pixels in pages.items():
+        image = atlas_image(page)
+        image.pixels.foreach_set(pixels.ravel())
+        image.update()
+        image.pack()
+
+
 def import_slideshow_image(image, image_number, slide_length, generator_scene, video=False, last_image=None):
     if len(image.name) > 20:
         image.name = image.name[0:19]
@@ -677,7 +1006,7 @@ def import_slideshow_image(image, image_number, slide_length, generator_scene, v
     faces = [(3, 2, 1, 0)]
     image_plane = add_object(generator_scene, image.name, 'MESH', mesh_verts=verts, mesh_faces=faces)
     image_plane.slideshow.name = image_plane.name
-    add_constraints(image_plane, 'Plane')
+    add_locks(image_plane, 'Plane')
 
     text_data = load_slide_text_data(bpy.path.abspath(image.filepath))
     image_plane.slideshow.text_photographer = text_data['photographer']
@@ -751,7 +1080,7 @@ def import_slideshow_image(image, image_number, slide_length, generator_scene, v
         target_empty = add_object(generator_scene, image_plane.name+' Target', 'EMPTY')
         target_empty.parent = image_plane
         target_empty.empty_display_size = 1
-        add_constraints(target_empty, 'Target')
+        add_locks(target_empty, 'Target')
         image_plane.slideshow.target = target_empty.name
 
         view_empty = add_object(generator_scene, image_plane.name+' View', 'EMPTY')
@@ -759,42 +1088,45 @@ def import_slideshow_image(image, image_number, slide_length, generator_scene, v
         view_empty.empty_display_size = 1
         view_empty.scale = aspect_ratio(generator_scene) / 2, .5, .001
         view_empty.empty_display_type = 'CUBE'
-        add_constraints(view_empty, 'View')
+        add_locks(view_empty, 'View')
         image_plane.slideshow.view = view_empty.name
 
-    index_text = add_object(generator_scene, image_plane.name+' Index', 'FONT')
-    index_text.parent = image_plane
-    index_text.location = (-1, -.33, 0)
-    index_text.data.align_x = 'RIGHT'
-    add_constraints(index_text, 'Text')
-
-    if not video:
-        transform_text = add_object(generator_scene, image_plane.name+' Transform', 'FONT')
-        transform_text.parent = image_plane
-        transform_text.location = (1, 0, 0)
-        transform_text.scale = .15, .15, 1
-        add_constraints(transform_text, 'Text')
-
-        extra_text = add_object(generator_scene, image_plane.name+' Extra', 'FONT')
-        extra_text.parent = image_plane
-        extra_text.location = (1, -.25, 0)
-        extra_text.scale = .15, .15, 1
-        add_constraints(extra_text, 'Text')
-
-    length_text = add_object(generator_scene, image_plane.name+' Length', 'FONT')
-    length_text.parent = image_plane
-    length_text.location = (1, .25, 0)
-    length_text.scale = .15, .15, 1
-    add_constraints(length_text, 'Text')
+    if use_label_objects():
+        index_text = add_object(generator_scene, image_plane.name+' Index', 'FONT')
+        index_text.parent = image_plane
+        index_text.location = (-1, -.33, 0)
+        index_text.data.align_x = 'RIGHT'
+        add_locks(index_text, 'Text')
+
+        if not video:
+            transform_text = add_object(generator_scene, image_plane.name+' Transform', 'FONT')
+            transform_text.parent = image_plane
+            transform_text.location = (1, 0, 0)
+            transform_text.scale = .15, .15, 1
+            add_locks(transform_text, 'Text')
+
+            extra_text = add_object(generator_scene, image_plane.name+' Extra', 'FONT')
+            extra_text.parent = image_plane
+            extra_text.location = (1, -.25, 0)
+            extra_text.scale = .15, .15, 1
+            add_locks(extra_text, 'Text')
+
+        length_text = add_object(generator_scene, image_plane.name+' Length', 'FONT')
+        length_text.parent = image_plane
+        length_text.location = (1, .25, 0)
+        length_text.scale = .15, .15, 1
+        add_locks(length_text, 'Text')
 
     image_group = bpy.data.collections.new(image_plane.name)
     image_group.objects.link(image_plane)
-    image_group.objects.link(index_text)
-    image_group.objects.link(length_text)
+    if use_label_objects():
+        image_group.objects.link(index_text)
+        image_group.objects.link(length_text)
+        if not video:
+            image_group.objects.link(transform_text)
+            image_group.objects.link(extra_text)
     if not video:
         image_group.objects.link(target_empty)
-        image_group.objects.link(transform_text)
-        image_group.objects.link(extra_text)
         image_group.objects.link(view_empty)
 
     image_plane.slideshow.index = image_number + 1
@@ -808,56 +1140,59 @@ def import_slideshow_image(image, image_number, slide_length, generator_scene, v
     return image_plane
 
 
-def add_constraints(constraint_object, constraint_type):
-    rotation_constraint = constraint_object.constraints.new(type='LIMIT_ROTATION')
-    location_constraint = constraint_object.constraints.new(type='LIMIT_LOCATION')
-    scale_constraint = constraint_object.constraints.new(type='LIMIT_SCALE')
+def add_locks(lock_object, lock_type):
+    """Sets up the allowed transforms of a generator object, these are enforced by clamp_locked_object"""
+    lock_object.slideshow.lock_type = lock_type
+    lock_object.slideshow.lock_location = lock_object.location
+    lock_object.slideshow.lock_scale = lock_object.scale
+
+
+def values_differ(first, second, tolerance=1e-6):
+    """Compare float vectors with a tolerance, since values stored as float32 are not exactly equal to python floats"""
+    return any(abs(a - b) > tolerance for a, b in zip(first, second))
 
-    rotation_constraint.use_limit_x = True
-    rotation_constraint.use_limit_y = True
-    if constraint_type != 'View':
-        rotation_constraint.use_limit_z = True
 
-    constraint_object.constraints[1].owner_space = 'LOCAL'
-    if constraint_type == 'Target' or constraint_type == 'View':
-        location_constraint.min_x = -1 * (aspect_ratio(bpy.context.scene)/2)
-        location_constraint.max_x = aspect_ratio(bpy.context.scene) / 2
-        location_constraint.min_y = -.5
-        location_constraint.max_y = .5
+def clamp_locked_object(lock_object, aspect):
+    """Moves a generator object back into the location, rotation and scale range allowed by its lock type"""
+    slideshow = lock_object.slideshow
+    lock_type = slideshow.lock_type
+    if not lock_type:
+        return
+
+    location = list(lock_object.location)
+    if lock_type == 'Target' or lock_type == 'View':
+        location[0] = min(max(location[0], -1 * (aspect / 2)), aspect / 2)
+        location[1] = min(max(location[1], -.5), .5)
     else:
-        location_constraint.min_x = constraint_object.location[0]
-        location_constraint.max_x = constraint_object.location[0]
-        location_constraint.min_y = constraint_object.location[1]
-        location_constraint.max_y = constraint_object.location[1]
-    location_constraint.use_max_x = True
-    location_constraint.use_min_x = True
-    if constraint_type != 'Plane':
-        location_constraint.use_max_y = True
-        location_constraint.use_min_y = True
-    location_constraint.use_max_z = True
-    location_constraint.use_min_z = True
-
-    scale_constraint.min_x = constraint_object.scale[0]
-    scale_constraint.max_x = constraint_object.scale[0]
-    scale_constraint.min_y = constraint_object.scale[1]
-    scale_constraint.max_y = constraint_object.scale[1]
-    scale_constraint.min_z = constraint_object.scale[2]
-    scale_constraint.max_z = constraint_object.scale[2]
-    if constraint_type != 'View':
-        scale_constraint.use_min_x = True
-        scale_constraint.use_max_x = True
-        scale_constraint.use_min_y = True
-        scale_constraint.use_max_y = True
-        scale_constraint.use_min_z = True
-        scale_constraint.use_max_z = True
-
-    if constraint_type == 'Text':
-        limit_location_constraint = constraint_object.constraints.new(type='LIMIT_LOCATION')
-        limit_location_constraint.owner_space = 'WORLD'
-        limit_location_constraint.use_max_x = True
-        limit_location_constraint.use_min_x = True
-        limit_location_constraint.min_x = constraint_object.location[0]
-        limit_location_constraint.max_x = constraint_object.location[0]
+        location[0] = slideshow.lock_location[0]
+        if lock_type != 'Plane':
+            location[1] = slideshow.lock_location[1]
+    location[2] = 0
+    if values_differ(lock_object.location, location):
+        lock_object.location = location
+
+    rotation = list(lock_object.rotation_euler)
+    rotation[0] = 0
+    rotation[1] = 0
+    if lock_type != 'View':
+        rotation[2] = 0
+    if values_differ(lock_object.rotation_euler, rotation):
+        lock_object.rotation_euler = rotation
+
+    if lock_type != 'View':
+        if values_differ(lock_object.scale, slideshow.lock_scale):
+            lock_object.scale = slideshow.lock_scale
+
+
+def clamp_transformed_objects(scene, depsgraph):
+    aspect = None
+    for update in depsgraph.updates:
+        if update.is_updated_transform and isinstance(update.id, bpy.types.Object):
+            lock_object = update.id.original
+            if lock_object.slideshow.lock_type:
+                if aspect is None:
+                    aspect = aspect_ratio(scene)
+                clamp_locked_object(lock_object, aspect)
 
 
 def is_video_file(file):
@@ -872,9 +1207,14 @@ def is_video_file(file):
 
 def clear_sequencer(scene):
     scene.sequence_editor_clear()
+    if scene.animation_data and scene.animation_data.action:
+        action = scene.animation_data.action
+        for fcurve in list(action.fcurves):
+            if fcurve.data_path.startswith('sequence_editor.'):
+                action.fcurves.remove(fcurve)
 
 
-def add_object(scene, name, object_type, mesh_verts=[], mesh_faces=[]):
+def add_object(scene, name, object_type, mesh_verts=[], mesh_faces=[], object_data=None):
     created = None
     if object_type == 'EMPTY':
         created = bpy.data.objects.new(name=name, object_data=None)
@@ -886,184 +1226,831 @@ def add_object(scene, name, object_type, mesh_verts=[], mesh_faces=[]):
         mesh.from_pydata(mesh_verts, [], mesh_faces)
         created = bpy.data.objects.new(name=name, object_data=mesh)
     elif object_type == 'CAMERA':
-        camera = bpy.data.cameras.new(name=name)
+        if object_data is not None:
+            camera = object_data
+        else:
+            camera = bpy.data.cameras.new(name=name)
         created = bpy.data.objects.new(name=name, object_data=camera)
     if created is not None:
         scene.collection.objects.link(created)
     return created
 
 
-def create_slideshow_slide(image_plane, i, generator_scene, image_scene_start, images, previous_image_clip, previous_image_plane):
+def build_slide_scene(image_plane, generator_scene, image_scene_name, render_settings):
+    """Create the scene for an image slide, with the animated camera and the extra"""
     base_name = generator_scene.snu_slideshow_generator.base_name
-    image_scene_name = base_name + '-' + image_plane.name
+    print('Generating scene for: '+image_scene_name)
+    purge_owned_data(image_plane, 'scene')
+    if bpy.data.scenes.find(image_scene_name) != -1:
+        bpy.data.scenes.remove(bpy.data.scenes[image_scene_name])
+    image_scene = create_scene(generator_scene, image_scene_name, render_settings)
+    image_scene.snu_slideshow_generator.generator_name = generator_scene.name
+    image_scene.snu_slideshow_generator.base_name = base_name
+    image_scene.eevee.taa_render_samples = generator_scene.snu_slideshow_generator.render_samples
+
+    image_scene_frames = int(get_fps(image_scene) * image_plane.slideshow.length)
+    image_scene.frame_end = image_scene_frames
+
+    target_empty = generator_scene.objects[image_plane.slideshow.target]
+    view_empty = generator_scene.objects[image_plane.slideshow.view]
+    generator_empties = [target_empty, view_empty]
+    render_plane = get_render_plane(image_plane, image_scene)
+    image_scene.collection.objects.link(render_plane)
+    if render_plane != image_plane:
+        target_empty = copy_plane_child(target_empty, render_plane, image_scene.name+' Target')
+        view_empty = copy_plane_child(view_empty, render_plane, image_scene.name+' View')
+    image_scene.collection.objects.link(target_empty)
+    image_scene.collection.objects.link(view_empty)
+
+    image_scene.world = shared_black_world()
+
+    transform_index = get_transform(image_plane.slideshow.transform)
+    if transform_index >= 0:
+        transform = transforms[transform_index]
+    else:
+        transform = transforms[0]
+    image_scene.cursor.location = (0.0, 0.0, 0.0)
+    image_scene.frame_current = 1
+    transform_empty = add_object(image_scene, transform['name'], 'EMPTY')
+    transform_empty.animation_data_create()
+    transform_action = bpy.data.actions.new(transform['name'])
+    transform_empty.animation_data.action = transform_action
+    aspect = aspect_ratio(image_scene)
+    multiplier = 1.375
+    if aspect > 1:
+        zoffset = aspect * multiplier
+    else:
+        zoffset = multiplier
+    transform_interpolation = image_plane.slideshow.transform_interpolation
+
+    transform_empty.location = (0, 0, zoffset)
+    compiled_transform = compile_transform(transform)
+    if 'influence' in compiled_transform:
+        constraint = transform_empty.constraints.new(type='COPY_LOCATION')
+        constraint.use_z = False
+        constraint.target = target_empty
+        constraint.influence = 0
+    for channel, data_path, data_index in transform_channels:
+        if channel not in compiled_transform:
+            continue
+        positions, values, sizes = compiled_transform[channel]
+        if channel == 'zLoc':
+            values = values + zoffset
+        elif channel == 'zRot':
+            values = np.radians(values)
+        elif channel == 'xLoc':
+            values = values * aspect
+        fcurve = transform_action.fcurves.new(data_path, index=data_index)
+        add_keyframes(fcurve, (positions * image_scene_frames) + 1, values, sizes * image_scene_frames, transform_interpolation)
+
+    if not transform_empty.animation_data.action_slot:
+        transform_empty.animation_data.action_slot = transform_action.slots[0]
+
+    camera = add_object(image_scene, generator_scene.name+' Camera', 'CAMERA', object_data=shared_camera_data())
+    camera.parent = transform_empty
+    image_scene.camera = camera
+
+    camera_scale = add_object(image_scene, generator_scene.name+' Camera Scale', 'EMPTY')
+    camera_scale.parent = render_plane
+    transform_empty.parent = camera_scale
+    camera_scale.location = view_empty.location
+    camera_scale.rotation_euler = view_empty.rotation_euler
+    camera_scale_value = (view_empty.scale[1] * 2)
+    camera_scale.scale = (camera_scale_value, camera_scale_value, camera_scale_value)
+
+    metadata = get_extra_metadata(image_plane.slideshow.extra)
+    image_scene['snu_render_cost'] = metadata['cost']
+    image_scene['snu_animated'] = metadata['animated']
+    try:
+        image_scene.eevee.use_shadows = metadata['needs_shadows']
+    except AttributeError:
+        pass
+    script = load_extra(image_plane.slideshow.extra)
+    if script is not None and not uses_extra_overlay(image_plane, generator_scene):
+        #extras should not change the active scene, but older ones may so it is restored after
+        window = bpy.context.window
+        current_scene = window.scene if window is not None else None
+        image = None
+        if metadata['uses_texture']:
+            image = get_extra_texture(generator_scene, image_plane.slideshow.extratexture, render_settings)
+        material = get_slide_material(image_plane)
+        material_nodes = get_material_elements(material, image_plane.slideshow.name)
+        if material_nodes is not None:
+            data = {
+                'image_scene': image_scene,
+                'image_plane': render_plane,
+                'material': material,
+                'material_texture': material_nodes['texture'],
+                'material_shadeless': material_nodes['shadeless'],
+                'material_shaded': material_nodes['shaded'],
+                'material_mix': material_nodes['mix'],
+                'material_output': material_nodes['output'],
+                'target_empty': target_empty,
+                'camera': camera,
+                'extra_amount': image_plane.slideshow.extraamount,
+                'extra_text': image_plane.slideshow.extratext,
+                'extra_texture': image,
+                'cache_directory': get_cache_directory(generator_scene)}
+            script.extra(data)
+        if window is not None and window.scene != current_scene:
+            window.scene = current_scene
+
+    if render_plane != image_plane:
+        own_data(image_plane, render_plane, 'scene')
+    own_scene_data(image_plane, image_scene, [image_plane, render_plane] + generator_empties, 'scene')
+    return image_scene
+
+
+def get_cache_directory(generator_scene):
+    """Returns the absolute path of the cache directory of a slideshow, creating it if needed.
+    Unsaved files cannot resolve a relative setting, so they use the temporary directory, as do directories that cannot be made."""
+    temp_directory = os.path.join(bpy.app.tempdir, 'slideshow_cache')
+    setting = generator_scene.snu_slideshow_generator.cache_directory
+    directory = bpy.path.abspath(setting)
+    if not directory or not os.path.isabs(directory) or (not bpy.data.filepath and setting.startswith('//')):
+        directory = temp_directory
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError as e:
+        print(f"Unable to use cache directory {directory}: {e}")
+        directory = temp_directory
+        os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def file_signature(filepath):
+    """Returns a list identifying the current state of a file, used in build hashes.
+    The path is normalized so files saved elsewhere with remapped relative paths, such as build worker copies, give the same signature."""
+    if filepath:
+        filepath = normalize_path(filepath)
+    if filepath and os.path.isfile(filepath):
+        stat = os.stat(filepath)
+        return [filepath, stat.st_mtime, stat.st_size]
+    return [filepath]
+
+
+def file_content_hash(filepath):
+    """Returns a hash of the size and the start and end of a file, so copies of a file in other places match"""
+    content = hashlib.sha1(str(os.path.getsize(filepath)).encode('utf-8'))
+    with open(filepath, 'rb') as file:
+        content.update(file.read(1048576))
+        file.seek(max(os.path.getsize(filepath) - 1048576, 0))
+        content.update(file.read(1048576))
+    return content.hexdigest()
+
+
+def build_hash(inputs):
+    """Returns a stable hash of a dictionary of build inputs"""
+    def json_default(value):
+        if isinstance(value, (set, frozenset)):
+            return sorted(value)
+        return str(value)
+    return hashlib.sha1(json.dumps(inputs, sort_keys=True, default=json_default).encode('utf-8')).hexdigest()
+
+
+def render_settings_inputs(generator_scene, render_settings):
+    """The render settings that affect a built scene, the output path is left out since it does not change the result"""
+    render = dict(render_settings['render'])
+    render.pop('filepath', None)
+    return {
+        'render': render,
+        'image_settings': render_settings['image_settings'],
+        'ffmpeg': render_settings['ffmpeg'],
+        'view_transform': generator_scene.view_settings.view_transform,
+        'version': bl_info['version']
+    }
+
+
+def slide_build_hash(image_plane, generator_scene, render_settings):
+    """Hash of everything that goes into building the scene of an image slide"""
+    slideshow = image_plane.slideshow
+    image_path = ''
+    material_nodes = get_material_elements(get_slide_material(image_plane), slideshow.name)
+    if material_nodes is not None and material_nodes['texture'].image is not None:
+        image_path = normalize_path(material_nodes['texture'].image.filepath)
+    target_empty = generator_scene.objects.get(slideshow.target)
+    view_empty = generator_scene.objects.get(slideshow.view)
+    extra_file = None
+    if slideshow.extra != 'None':
+        extra_file = get_extra(slideshow.extra)
+    inputs = {
+        'image': file_signature(image_path),
+        'rotate': slideshow.rotate,
+        'plane': [slideshow.index, [list(row) for row in image_plane.matrix_world]],
+        'transform': slideshow.transform,
+        'transform_interpolation': slideshow.transform_interpolation,
+        'length': slideshow.length,
+        'target': list(target_empty.location) if target_empty else None,
+        'view': [list(view_empty.location), list(view_empty.rotation_euler), list(view_empty.scale)] if view_empty else None,
+        'extra': slideshow.extra,
+        'extra_script': file_signature(extra_file),
+        'extra_amount': slideshow.extraamount,
+        'extra_text': slideshow.extratext,
+        'extra_texture': file_signature(slideshow.extratexture),
+        'transcode_extra_texture': generator_scene.snu_slideshow_generator.transcode_extra_textures,
+        'render_samples': generator_scene.snu_slideshow_generator.render_samples,
+        'overlay': uses_extra_overlay(image_plane, generator_scene),
+        'render_settings': render_settings_inputs(generator_scene, render_settings)
+    }
+    return build_hash(inputs)
+
+
+def find_built_scene(image_plane, image_scene_name, slide_hash):
+    """Returns the existing scene of a slide if it was built with the given hash"""
+    image_scene = bpy.data.scenes.get(image_scene_name)
+    if image_scene is not None and image_scene.get('snu_build_hash') == slide_hash and image_scene.get('snu_slide_owner') == image_plane.name:
+        return image_scene
+    return None
+
+
+def get_slide_scene(image_plane, generator_scene, image_scene_name, render_settings=None):
+    """Returns the scene for an image slide, the existing scene is reused if none of its build inputs have changed"""
+    if render_settings is None:
+        render_settings = snapshot_render_settings(generator_scene)
+    slide_hash = slide_build_hash(image_plane, generator_scene, render_settings)
+    if generator_scene.snu_slideshow_generator.incremental_build or image_scene_name in worker_built_scenes:
+        image_scene = find_built_scene(image_plane, image_scene_name, slide_hash)
+        if image_scene is not None:
+            print('Reusing unchanged scene: '+image_scene_name)
+            return image_scene
+    image_scene = build_slide_scene(image_plane, generator_scene, image_scene_name, render_settings)
+    image_scene['snu_build_hash'] = slide_hash
+    return image_scene
+
+
+def text_overlay_build_hash(generator_scene, slide, render_settings):
+    """Hash of everything that goes into building the text overlay scene of a slide"""
+    settings = generator_scene.snu_slideshow_generator
+    slideshow = slide.slideshow
+    inputs = {
+        'enabled': slideshow.enable_text_overlay,
+        'text': [slideshow.text_photographer, slideshow.text_when, slideshow.text_who, slideshow.text_where],
+        'alignment': settings.text_alignment,
+        'size': settings.text_size,
+        'y_offset': settings.text_y_offset,
+        'length': slideshow.length,
+        'typewriter': 'table',
+        'render_settings': render_settings_inputs(generator_scene, render_settings)
+    }
+    return build_hash(inputs)
+
+
+def get_text_overlay_scene(generator_scene, slide, render_settings=None):
+    """Returns the text overlay scene for a slide, the existing scene is reused if its text and layout have not changed"""
+    if render_settings is None:
+        render_settings = snapshot_render_settings(generator_scene)
+    text_hash = text_overlay_build_hash(generator_scene, slide, render_settings)
+    text_scene_name = f"{generator_scene.snu_slideshow_generator.base_name}-{slide.name}-TextOverlay"
+    if generator_scene.snu_slideshow_generator.incremental_build:
+        text_scene = bpy.data.scenes.get(text_scene_name)
+        if text_scene is not None and text_scene.get('snu_build_hash') == text_hash and text_scene.get('snu_slide_owner') == slide.name:
+            return text_scene
+    purge_owned_data(slide, 'text')
+    text_scene = create_slide_text_overlay_scene_with_improved_outline(generator_scene, slide, slide.slideshow.length, render_settings)
+    if text_scene:
+        own_scene_data(slide, text_scene, [], 'text')
+        text_scene['snu_build_hash'] = text_hash
+    return text_scene
+
+
+def add_text_overlay_strips(generator_scene, slide, clip):
+    """Add the text overlay of a slide as a meta strip of sequencer text strips over clip.
+    The layout matches the text overlay scene, the typewriter effect is made of strips showing the text one word further each."""
+    settings = generator_scene.snu_slideshow_generator
+    fps = get_fps(generator_scene)
+    frames_per_char = max(1, int(fps / 8))
+    delay_between_texts = int(fps * 1.2)
+    frame_start = clip.frame_final_start
+    frame_end = clip.frame_final_end
+
+    # The text scene camera sees 3.6 units across the wider side of the frame
+    aspect = aspect_ratio(generator_scene)
+    view_x = 3.6 if aspect >= 1 else 3.6 * aspect
+    view_y = view_x / aspect
+    font_size = settings.text_size / view_x * generator_scene.render.resolution_x
+    location_x = 0.5 + get_text_location(generator_scene, 0)[0] / view_x
+    y_offset = settings.text_y_offset
+
+    meta = None
+    channel = 1
+    for field_name, label in text_overlay_fields:
+        field_value = getattr(slide.slideshow, field_name, '')
+        if not field_value:
+            continue
+        if meta is None:
+            meta = generator_scene.sequence_editor.sequences.new_meta(name=f"{slide.name}_Text", channel=5, frame_start=frame_start)
+        text_content = f"{label}: {field_value}"
+        steps = [match.end() for match in re.finditer(r'\S+', text_content)]
+        for index, length in enumerate(steps):
+            step_start = frame_start + (channel - 1) * delay_between_texts + length * frames_per_char
+            if index + 1 < len(steps):
+                step_end = frame_start + (channel - 1) * delay_between_texts + steps[index + 1] * frames_per_char
+            else:
+                step_end = frame_end
+            if step_start >= min(step_end, frame_end):
+                continue
+            strip = meta.sequences.new_effect(name=f"{slide.name}_{field_name}", type='TEXT', channel=channel, frame_start=step_start, frame_end=min(step_end, frame_end))
+            strip.text = text_content[:length]
+            strip.font_size = font_size
+            strip.location = (location_x, 0.5 + y_offset / view_y)
+            strip.anchor_x = settings.text_alignment
+            strip.anchor_y = 'CENTER'
+            strip.alignment_x = settings.text_alignment
+            strip.color = (1.0, 1.0, 1.0, 1.0)
+            strip.use_outline = True
+            strip.outline_color = (0.0, 0.0, 0.0, 1.0)
+            strip.outline_width = 0.05
+            strip.blend_type = 'ALPHA_OVER'
+        channel += 1
+        y_offset -= 0.35
+
+    if meta is None:
+        return None
+    meta.frame_final_end = frame_end
+    meta.blend_type = 'ALPHA_OVER'
+    keyframe_strip(generator_scene, meta, 'blend_alpha', [(frame_end - 20, 1), (frame_end, 0)])
+    return meta
+
+
+def remove_text_overlay_scene(text_scene):
+    """Remove a text overlay scene with its objects, their text curves and actions"""
+    datablocks = [text_scene]
+    for scene_object in text_scene.objects:
+        datablocks.append(scene_object)
+        if is_unshared(scene_object.data):
+            datablocks.append(scene_object.data)
+        if scene_object.animation_data and is_unshared(scene_object.animation_data.action):
+            datablocks.append(scene_object.animation_data.action)
+        for slot in scene_object.material_slots:
+            material = slot.material
+            if is_unshared(material) and material not in datablocks:
+                datablocks.append(material)
+                if material.node_tree and material.node_tree.animation_data and is_unshared(material.node_tree.animation_data.action):
+                    datablocks.append(material.node_tree.animation_data.action)
+    bpy.data.batch_remove(datablocks)
+
+
+def add_cached_text_overlay(generator_scene, slide, clip, render_settings=None):
+    """Add the text overlay of a slide over clip as an image strip of a cached transparent png sequence.
+    The overlay is rendered once for every different text, layout, length and resolution, so repeated credits are reused."""
+    settings = generator_scene.snu_slideshow_generator
+    slideshow = slide.slideshow
+    if render_settings is None:
+        render_settings = snapshot_render_settings(generator_scene)
+    text = [getattr(slideshow, field[0], '') for field in text_overlay_fields]
+    render_inputs = render_settings_inputs(generator_scene, render_settings)
+    # The overlay scene always renders at 100%
+    render_inputs['render'].pop('resolution_percentage', None)
+    key = {
+        'text': text,
+        'alignment': settings.text_alignment,
+        'size': settings.text_size,
+        'y_offset': settings.text_y_offset,
+        'length': slideshow.length,
+        'render_settings': render_inputs
+    }
+    frames = int(get_fps(generator_scene) * slideshow.length)
+    directory = os.path.join(get_cache_directory(generator_scene), 'text-'+build_hash(key)[:16])
+    files = [str(frame).zfill(4)+'.png' for frame in range(1, frames + 1)]
+    if not files or not any(text):
+        return None
+
+    if not all(os.path.isfile(os.path.join(directory, file)) for file in files):
+        text_scene = create_slide_text_overlay_scene_with_improved_outline(generator_scene, slide, slideshow.length, render_settings)
+        if text_scene is None:
+            return None
+        print('Rendering text overlay: '+directory)
+        text_scene.frame_start = 1
+        text_scene.frame_end = frames
+        text_scene.render.use_sequencer = False
+        text_scene.render.use_compositing = False
+        text_scene.render.image_settings.file_format = 'PNG'
+        text_scene.render.image_settings.color_mode = 'RGBA'
+        text_scene.render.filepath = os.path.join(directory, '####')
+        bpy.ops.render.render(animation=True, scene=text_scene.name)
+        remove_text_overlay_scene(text_scene)
+
+    text_clip = generator_scene.sequence_editor.sequences.new_image(name=f"{slide.name}_Text", filepath=os.path.join(directory, files[0]), channel=5, frame_start=clip.frame_final_start, fit_method='STRETCH')
+    for file in files[1:]:
+        text_clip.elements.append(file)
+    text_clip.frame_final_end = clip.frame_final_end
+    text_clip.blend_type = 'ALPHA_OVER'
+    return text_clip
+
+
+def remove_shared_text_overlay(generator_scene):
+    """Remove the text overlay scene made for the whole slideshow, if there is one"""
+    text_scene_name = f"{generator_scene.snu_slideshow_generator.base_name}-TextOverlay"
+    if text_scene_name in bpy.data.scenes:
+        remove_text_overlay_scene(bpy.data.scenes[text_scene_name])
+
+
+def add_shared_text_overlay(generator_scene, slide_clips, render_settings=None):
+    """Build one text overlay scene for the whole slideshow and add it as a single scene strip on channel 5.
+    slide_clips is a list of (slide, clip), the text of each slide is only shown during its clip.
+    All text objects use one text and one outline material, and fade through their snu_text_alpha property."""
+    settings = generator_scene.snu_slideshow_generator
+    text_scene_name = f"{settings.base_name}-TextOverlay"
+    remove_shared_text_overlay(generator_scene)
+    slide_clips = [(slide, clip) for slide, clip in slide_clips if any(getattr(slide.slideshow, field[0], '') for field in text_overlay_fields)]
+    if not slide_clips:
+        return None
+
+    text_scene = create_scene(generator_scene, text_scene_name, render_settings)
+    fps = get_fps(text_scene)
+    frame_end = max(clip.frame_final_end for slide, clip in slide_clips)
+    text_scene.frame_start = 1
+    text_scene.frame_end = frame_end
+    text_scene.render.film_transparent = True
+    text_scene.eevee.use_taa_reprojection = True
+    text_scene.eevee.taa_samples = 16
+    text_scene.world = shared_transparent_world()
+    delay_between_texts = int(fps * 1.2)
+
+    for slide, clip in slide_clips:
+        start = clip.frame_final_start
+        end = clip.frame_final_end
+        current_start_frame = start
+        y_offset = settings.text_y_offset
+        for field_name, label in text_overlay_fields:
+            field_value = getattr(slide.slideshow, field_name, '')
+            if not field_value:
+                continue
+            main_text_obj, outline_text_obj, main_material, outline_material, animation_duration = create_typewriter_text_with_improved_outline(
+                text_scene,
+                f"{label}: {field_value}",
+                f"{slide.name}_{field_name.title()}_Text",
+                location=get_text_location(generator_scene, y_offset, settings.text_size),
+                size=settings.text_size,
+                alignment=settings.text_alignment,
+                start_frame=current_start_frame,
+                shared_materials=True
+            )
+            for text_obj in (main_text_obj, outline_text_obj):
+                text_obj["snu_text_alpha"] = 1.0
+                write_keyframes(text_obj, '["snu_text_alpha"]', [(end - 20, 1.0), (end, 0.0)])
+                visibility = [(start, 0), (end, 1)]
+                if start > 1:
+                    visibility.insert(0, (1, 1))
+                write_keyframes(text_obj, 'hide_render', visibility, interpolation='CONSTANT')
+                write_keyframes(text_obj, 'hide_viewport', visibility, interpolation='CONSTANT')
+            current_start_frame += delay_between_texts
+            y_offset -= 0.35
+
+    camera = add_object(text_scene, f"{text_scene.name}_Camera", 'CAMERA', object_data=shared_camera_data(0.1, 100.0))
+    camera.location = (0, 0, 5)
+    text_scene.camera = camera
+
+    text_clip = generator_scene.sequence_editor.sequences.new_scene(scene=text_scene, name=f"{text_scene.name}_Text", channel=5, frame_start=1)
+    text_clip.frame_final_end = frame_end
+    text_clip.blend_type = 'ALPHA_OVER'
+    return text_clip
+
+
+def transcode_movie(generator_scene, filepath, render_settings=None):
+    """Render a movie once to a png sequence at the render resolution in the cache directory, stretched like it is on a plane.
+    Returns the path of the first frame and the number of frames, existing transcodes of the same file are reused."""
+    render = generator_scene.render
+    resolution = [int(render.resolution_x * render.resolution_percentage / 100), int(render.resolution_y * render.resolution_percentage / 100)]
+    directory = os.path.join(get_cache_directory(generator_scene), 'texture-'+build_hash([file_signature(filepath), resolution])[:16])
+    first_frame = os.path.join(directory, '0001.png')
+    info_file = os.path.join(directory, 'frames.json')
+    if os.path.isfile(info_file):
+        with open(info_file) as info:
+            return first_frame, json.load(info)['frames']
+
+    print('Transcoding extra texture: '+filepath)
+    if render_settings is None:
+        render_settings = snapshot_render_settings(generator_scene)
+    transcode_scene = create_scene(generator_scene, 'Slideshow Texture Transcode', render_settings)
+    transcode_scene.sequence_editor_create()
+    strip = transcode_scene.sequence_editor.sequences.new_movie(name='Transcode', filepath=filepath, channel=1, frame_start=1, fit_method='STRETCH')
+    frames = strip.frame_duration
+    transcode_scene.frame_start = 1
+    transcode_scene.frame_end = frames
+    transcode_scene.render.use_sequencer = True
+    transcode_scene.render.use_compositing = False
+    transcode_scene.render.image_settings.file_format = 'PNG'
+    transcode_scene.render.image_settings.color_mode = 'RGBA'
+    transcode_scene.render.image_settings.compression = 15
+    transcode_scene.render.filepath = os.path.join(directory, '####')
+    bpy.ops.render.render(animation=True, scene=transcode_scene.name)
+    bpy.data.scenes.remove(transcode_scene)
+    with open(info_file, 'w') as info:
+        json.dump({'frames': frames, 'source': filepath}, info)
+    return first_frame, frames
+
+
+def transition_mask(generator_scene, filepath, inverted, render_settings=None):
+    """Render a custom transition movie once to a grayscale png sequence at the render resolution in the cache directory.
+    The first and last frames are solid start and end colors, the inverted variant is stored separately.
+    Returns the directory and the number of frames, existing masks of the same file are reused."""
+    render = generator_scene.render
+    resolution = [int(render.resolution_x * render.resolution_percentage / 100), int(render.resolution_y * render.resolution_percentage / 100)]
+    directory = os.path.join(get_cache_directory(generator_scene), 'transition-'+build_hash([file_signature(filepath), resolution, inverted])[:16])
+    info_file = os.path.join(directory, 'frames.json')
+    if os.path.isfile(info_file):
+        with open(info_file) as info:
+            return directory, json.load(info)['frames']
+
+    print('Caching transition mask: '+filepath)
+    if inverted:
+        start_color = (1, 1, 1)
+        end_color = (0, 0, 0)
+    else:
+        start_color = (0, 0, 0)
+        end_color = (1, 1, 1)
+    if render_settings is None:
+        render_settings = snapshot_render_settings(generator_scene)
+    mask_scene = create_scene(generator_scene, 'Slideshow Transition Mask', render_settings)
+    mask_scene.sequence_editor_create()
+    strips = mask_scene.sequence_editor.sequences
+    strip = strips.new_movie(name='Transition', filepath=filepath, channel=1, frame_start=2, fit_method='STRETCH')
+    if inverted:
+        invert_modifier = strip.modifiers.new(name='Invert Colors', type='CURVES')
+        invert_modifier.curve_mapping.curves[3].points[0].location = (0, 1)
+        invert_modifier.curve_mapping.curves[3].points[1].location = (1, 0)
+    frames = strip.frame_duration + 2
+    start = strips.new_effect(name='Start', type='COLOR', channel=2, frame_start=1, frame_end=2)
+    start.color = start_color
+    end = strips.new_effect(name='End', type='COLOR', channel=2, frame_start=frames, frame_end=frames + 1)
+    end.color = end_color
+    mask_scene.frame_start = 1
+    mask_scene.frame_end = frames
+    mask_scene.render.use_sequencer = True
+    mask_scene.render.use_compositing = False
+    mask_scene.render.image_settings.file_format = 'PNG'
+    mask_scene.render.image_settings.color_mode = 'BW'
+    mask_scene.render.image_settings.compression = 15
+    mask_scene.render.filepath = os.path.join(directory, '####')
+    bpy.ops.render.render(animation=True, scene=mask_scene.name)
+    bpy.data.scenes.remove(mask_scene)
+    with open(info_file, 'w') as info:
+        json.dump({'frames': frames, 'source': filepath}, info)
+    return directory, frames
+
+
+def stretch_files(files, length):
+    """Returns a list of length file names, picking evenly spaced files so the sequence plays over that many frames"""
+    if not files or length <= 0:
+        return []
+    return [files[int(frame * len(files) / length)] for frame in range(length)]
+
+
+def blurred_video_background(generator_scene, filepath, rotation, scale, render_settings=None):
+    """Render a movie once heavily blurred at a small resolution to a png sequence in the cache directory.
+    The movie is rotated and scaled to fill the frame, the sequence is meant to be stretched up to the render size.
+    Returns the directory and the list of files, existing renders of the same file are reused."""
+    render = generator_scene.render
+    resolution = [max(int(render.resolution_x / 8), 8), max(int(render.resolution_y / 8), 8)]
+    directory = os.path.join(get_cache_directory(generator_scene), 'background-'+build_hash([file_signature(filepath), resolution, rotation, round(scale, 4)])[:16])
+    info_file = os.path.join(directory, 'frames.json')
+    if os.path.isfile(info_file):
+        with open(info_file) as info:
+            frames = json.load(info)['frames']
+    else:
+        print('Rendering blurred video background: '+filepath)
+        if render_settings is None:
+            render_settings = snapshot_render_settings(generator_scene)
+        blur_scene = create_scene(generator_scene, 'Slideshow Video Background', render_settings)
+        blur_scene.render.resolution_x = resolution[0]
+        blur_scene.render.resolution_y = resolution[1]
+        blur_scene.sequence_editor_create()
+        strips = blur_scene.sequence_editor.sequences
+        strip = strips.new_movie(name='Background', filepath=filepath, channel=1, frame_start=1, fit_method='ORIGINAL')
+        strip.transform.rotation = rotation
+        strip.transform.scale_x = scale * resolution[0] / render.resolution_x
+        strip.transform.scale_y = scale * resolution[0] / render.resolution_x
+        frames = strip.frame_duration
+        blur = strips.new_effect(name='Blur', type='GAUSSIAN_BLUR', channel=2, seq1=strip, frame_start=1)
+        blur.size_x = 6
+        blur.size_y = 6
+        blur_scene.frame_start = 1
+        blur_scene.frame_end = frames
+        blur_scene.render.use_sequencer = True
+        blur_scene.render.use_compositing = False
+        blur_scene.render.image_settings.file_format = 'PNG'
+        blur_scene.render.image_settings.color_mode = 'RGB'
+        blur_scene.render.image_settings.compression = 15
+        blur_scene.render.filepath = os.path.join(directory, '####')
+        bpy.ops.render.render(animation=True, scene=blur_scene.name)
+        bpy.data.scenes.remove(blur_scene)
+        with open(info_file, 'w') as info:
+            json.dump({'frames': frames, 'source': filepath}, info)
+    return directory, [str(frame).zfill(4)+'.png' for frame in range(1, frames + 1)]
+
+
+def add_transition_mask(generator_scene, filepath, inverted, name, channel, frame_start, frame_end, render_settings=None):
+    """Returns an image strip showing the cached mask of a custom transition movie stretched from frame_start to frame_end"""
+    directory, frames = transition_mask(generator_scene, filepath, inverted, render_settings)
+    files = [str(frame).zfill(4)+'.png' for frame in range(1, frames + 1)]
+    elements = [files[0]] + stretch_files(files[1:-1], frame_end - frame_start - 2) + [files[-1]]
+    strip = generator_scene.sequence_editor.sequences.new_image(name=name, filepath=os.path.join(directory, elements[0]), channel=channel, frame_start=frame_start, fit_method='STRETCH')
+    for element in elements[1:]:
+        strip.elements.append(element)
+    return strip
+
+
+def get_extra_texture(generator_scene, filepath, render_settings=None):
+    """Returns the image for an extra texture, every slide using the same file gets the same image.
+    If transcoding is enabled, movies are replaced by a cached image sequence at the render resolution."""
+    filepath = bpy.path.abspath(filepath)
+    if not filepath or not os.path.isfile(filepath):
+        return None
+    frames = None
+    if generator_scene.snu_slideshow_generator.transcode_extra_textures and is_video_file(filepath):
+        filepath, frames = transcode_movie(generator_scene, filepath, render_settings)
+    image = get_image(filepath)
+    if image is None:
+        image = index_image(load_image(filepath, check_existing=True))
+        if image is None:
+            return None
+        if frames is not None:
+            image.source = 'SEQUENCE'
+    if frames is not None:
+        image['snu_frame_count'] = frames
+    return image
+
+
+def uses_extra_overlay(image_plane, generator_scene):
+    """Returns True if the extra of a slide is shown as a 2D overlay in the sequencer instead of being built in the slide scene"""
+    if not generator_scene.snu_slideshow_generator.overlay_extras:
+        return False
+    script = load_extra(image_plane.slideshow.extra)
+    return script is not None and hasattr(script, 'overlay')
+
+
+def render_overlay(generator_scene, overlay, data, render_settings):
+    """Render the camera space objects of an overlay spec once to a transparent png sequence in the cache directory.
+    Returns the directory and the list of files, existing renders with the same key are reused."""
+    render = generator_scene.render
+    key = [overlay.get('key', []), data['resolution'], data['frames'], render.fps, render.fps_base, generator_scene.snu_slideshow_generator.render_samples, generator_scene.view_settings.view_transform, bl_info['version']]
+    directory = os.path.join(data['cache_directory'], 'overlay-'+build_hash(key)[:16])
+    files = [str(frame).zfill(4)+'.png' for frame in range(1, data['frames'] + 1)]
+    if all(os.path.isfile(os.path.join(directory, file)) for file in files):
+        return directory, files
+
+    print('Rendering overlay: '+directory)
+    overlay_scene = create_scene(generator_scene, 'Slideshow Overlay Render', render_settings)
+    overlay_scene.frame_start = 1
+    overlay_scene.frame_end = data['frames']
+    overlay_scene.eevee.taa_render_samples = generator_scene.snu_slideshow_generator.render_samples
+    overlay_scene.world = shared_transparent_world()
+    overlay_scene.render.film_transparent = True
+    overlay_scene.render.use_sequencer = False
+    overlay_scene.render.image_settings.file_format = 'PNG'
+    overlay_scene.render.image_settings.color_mode = 'RGBA'
+    overlay_scene.render.filepath = os.path.join(directory, '####')
+    camera = add_object(overlay_scene, 'Overlay Camera', 'CAMERA', object_data=shared_camera_data())
+    overlay_scene.camera = camera
+    overlay['render'](overlay_scene, camera, data)
+    bpy.ops.render.render(animation=True, scene=overlay_scene.name)
+
+    datablocks = [overlay_scene]
+    for scene_object in overlay_scene.objects:
+        datablocks.append(scene_object)
+        if is_unshared(scene_object.data):
+            datablocks.append(scene_object.data)
+        if scene_object.animation_data and is_unshared(scene_object.animation_data.action):
+            datablocks.append(scene_object.animation_data.action)
+    bpy.data.batch_remove(datablocks)
+    return directory, files
+
+
+def get_extra_overlay(image_plane, generator_scene, frames, render_settings):
+    """Returns the overlay spec of the extra of a slide, with 'directory' and 'files' of the images to show, or None.
+    The 'overlay' function of an extra returns a dictionary with one of:
+        'image' - the path of a still image
+        'movie' - the path of a movie
+        'directory' and 'files' - an image sequence
+        'render' - a function called with (scene, camera, data) that adds camera space objects, rendered once per 'key'
+    and optionally 'opacity' and 'blend_type' for the strip, and 'fit_method' for images and movies."""
+    if not uses_extra_overlay(image_plane, generator_scene):
+        return None
+    script = load_extra(image_plane.slideshow.extra)
+    render = generator_scene.render
+    image = None
+    if get_extra_metadata(image_plane.slideshow.extra)['uses_texture']:
+        image = get_extra_texture(generator_scene, image_plane.slideshow.extratexture, render_settings)
+    data = {
+        'resolution': (int(render.resolution_x * render.resolution_percentage / 100), int(render.resolution_y * render.resolution_percentage / 100)),
+        'frames': frames,
+        'fps': get_fps(generator_scene),
+        'extra_amount': image_plane.slideshow.extraamount,
+        'extra_text': image_plane.slideshow.extratext,
+        'extra_texture': image,
+        'cache_directory': get_cache_directory(generator_scene)}
+    overlay = script.overlay(data)
+    if not overlay:
+        return None
+    overlay = dict(overlay)
+    if 'render' in overlay:
+        overlay['directory'], overlay['files'] = render_overlay(generator_scene, overlay, data, render_settings)
+        overlay.setdefault('fit_method', 'ORIGINAL')
+    elif 'image' in overlay:
+        overlay['directory'], file = os.path.split(overlay['image'])
+        overlay['files'] = [file]
+    return overlay
+
+
+def premix_audio_track(generator_scene, filepath):
+    """Mix the audio track looped over the length of the slideshow into one flac file in the cache directory.
+    Loops are crossfaded over audio_loop_fade and the end fades out over audio_fade_length.
+    Returns the path of the file, or None if the track could not be read. Existing mixes of the same settings are reused."""
+    settings = generator_scene.snu_slideshow_generator
+    fps = get_fps(generator_scene)
+    key = [file_signature(filepath), generator_scene.frame_end, fps, settings.audio_loop_fade, settings.audio_fade_length]
+    mix_file = os.path.join(get_cache_directory(generator_scene), 'audio-'+build_hash(key)[:16]+'.flac')
+    if os.path.isfile(mix_file):
+        return mix_file
+
+    track = aud.Sound(filepath)
+    rate = track.specs[0]
+    if track.length <= 0 or rate <= 0:
+        print('Unable to premix audio track, adding looped strips instead: '+filepath)
+        return None
+    print('Mixing audio track: '+filepath)
+    track_length = track.length / rate
+    length = generator_scene.frame_end / fps
+    loop_fade = min(settings.audio_loop_fade / fps, track_length / 2)
+    fade_length = min(settings.audio_fade_length / fps, length)
+
+    mix = None
+    start = 0
+    while start < length:
+        loop = track
+        if start > 0 and loop_fade > 0:
+            loop = loop.fadein(0, loop_fade)
+        if start + track_length < length and loop_fade > 0:
+            loop = loop.fadeout(track_length - loop_fade, loop_fade)
+        if mix is None:
+            mix = loop
+        else:
+            mix = mix.mix(loop.delay(start))
+        start = start + track_length - loop_fade
+    mix = mix.limit(0, length)
+    if fade_length > 0:
+        mix = mix.fadeout(length - fade_length, fade_length)
+    mix.write(mix_file, rate=rate, channels=aud.CHANNELS_STEREO, format=aud.FORMAT_S16, container=aud.CONTAINER_FLAC, codec=aud.CODEC_FLAC)
+    return mix_file
+
+
+def write_keyframes(datablock, path, keys, interpolation='BEZIER'):
+    """Writes (frame, value) keyframes for a property straight into the action of a datablock, without changing the current frame"""
+    if not datablock.animation_data:
+        datablock.animation_data_create()
+    action = datablock.animation_data.action
+    if action is None:
+        action = bpy.data.actions.new(name=datablock.name+'Action')
+        datablock.animation_data.action = action
+    fcurve = action.fcurves.find(path)
+    if fcurve is None:
+        fcurve = action.fcurves.new(path)
+    for frame, value in keys:
+        point = fcurve.keyframe_points.insert(frame, value, options={'FAST'})
+        point.interpolation = interpolation
+    fcurve.update()
+    if not datablock.animation_data.action_slot and len(action.slots):
+        datablock.animation_data.action_slot = action.slots[0]
+
+
+def keyframe_strip(scene, strip, data_path, keys):
+    """Writes (frame, value) keyframes for a strip property straight into the scene action"""
+    write_keyframes(scene, strip.path_from_id(data_path), keys)
+
+
+def add_overlay_meta(generator_scene, image_scene, overlay, channel, frame_start):
+    """Returns a meta strip holding the slide scene strip with the overlay of its extra composited over it"""
+    meta = generator_scene.sequence_editor.sequences.new_meta(name=image_scene.name, channel=channel, frame_start=frame_start)
+    scene_clip = meta.sequences.new_scene(scene=image_scene, name=image_scene.name+' Scene', channel=1, frame_start=frame_start)
+    fit_method = overlay.get('fit_method', 'FILL')
+    if 'movie' in overlay:
+        overlay_clip = meta.sequences.new_movie(name=image_scene.name+' Overlay', filepath=overlay['movie'], channel=2, frame_start=frame_start, fit_method=fit_method)
+    else:
+        overlay_clip = meta.sequences.new_image(name=image_scene.name+' Overlay', filepath=os.path.join(overlay['directory'], overlay['files'][0]), channel=2, frame_start=frame_start, fit_method=fit_method)
+        for file in overlay['files'][1:]:
+            overlay_clip.elements.append(file)
+    overlay_clip.frame_final_end = scene_clip.frame_final_end
+    overlay_clip.blend_type = overlay.get('blend_type', 'ALPHA_OVER')
+    overlay_clip.blend_alpha = overlay.get('opacity', 1.0)
+    return meta
+
+
+def create_slideshow_slide(image_plane, i, generator_scene, image_scene_start, images, previous_image_clip, previous_image_plane, render_settings=None):
+    image_scene_name = slide_scene_name(generator_scene, image_plane)
 
     if not generator_scene.sequence_editor:
         generator_scene.sequence_editor_create()
 
     if not image_plane.slideshow.videofile:
-        print('Generating scene for: '+image_scene_name)
-        if bpy.data.scenes.find(image_scene_name) != -1:
-            bpy.data.scenes.remove(bpy.data.scenes[image_scene_name])
-        image_scene = create_scene(generator_scene, image_scene_name)
-        image_scene.snu_slideshow_generator.generator_name = generator_scene.name
-        image_scene.snu_slideshow_generator.base_name = base_name
-        image_scene.eevee.taa_render_samples = generator_scene.snu_slideshow_generator.render_samples
-
-        image_scene_frames = int(get_fps(image_scene) * image_plane.slideshow.length)
-        image_scene.frame_end = image_scene_frames
-
-        target_empty = generator_scene.objects[image_plane.slideshow.target]
-        view_empty = generator_scene.objects[image_plane.slideshow.view]
-        image_scene.collection.objects.link(image_plane)
-        image_scene.collection.objects.link(target_empty)
-        image_scene.collection.objects.link(view_empty)
-
-        world = bpy.data.worlds.new(image_scene.name)
-        image_scene.world = world
-        world.use_nodes = False
-        world.color = (0, 0, 0)
+        image_scene_frames = int(get_fps(generator_scene) * image_plane.slideshow.length)
+        image_scene = get_slide_scene(image_plane, generator_scene, image_scene_name, render_settings)
 
-        transform_index = get_transform(image_plane.slideshow.transform)
-        if transform_index >= 0:
-            transform = transforms[transform_index]
+        overlay = get_extra_overlay(image_plane, generator_scene, image_scene_frames, render_settings)
+        if overlay is None:
+            clip = generator_scene.sequence_editor.sequences.new_scene(scene=image_scene, name=image_scene.name, channel=((i % 2) + 1), frame_start=image_scene_start)
         else:
-            transform = transforms[0]
-        image_scene.cursor.location = (0.0, 0.0, 0.0)
-        image_scene.frame_current = 1
-        transform_empty = add_object(image_scene, transform['name'], 'EMPTY')
-        transform_empty.animation_data_create()
-        transform_action = bpy.data.actions.new(transform['name'])
-        transform_empty.animation_data.action = transform_action
-        aspect = aspect_ratio(image_scene)
-        multiplier = 1.375
-        if aspect > 1:
-            zoffset = aspect * multiplier
-        else:
-            zoffset = multiplier
-        transform_interpolation = image_plane.slideshow.transform_interpolation
-
-        transform_empty.location = (0, 0, zoffset)
-        if 'zLoc' in transform.keys():
-            locations = len(transform['zLoc'])
-            fcurve = transform_action.fcurves.new('location', index=2)
-            for index, location in enumerate(transform['zLoc']):
-                if locations == 1:
-                    pointx = 1
-                else:
-                    pointx = ((index * image_scene_frames)/(locations - 1)) + 1
-                pointy = transform['zLoc'][index][0] + zoffset
-                pointsize = (transform['zLoc'][index][1]) * (image_scene_frames / locations / 2)
-                point = fcurve.keyframe_points.insert(frame=pointx, value=pointy)
-                point.interpolation = transform_interpolation
-                point.handle_left_type = 'FREE'
-                point.handle_right_type = 'FREE'
-                point.handle_left = (pointx - pointsize, pointy)
-                point.handle_right = (pointx + pointsize, pointy)
-        if 'zRot' in transform.keys():
-            locations = len(transform['zRot'])
-            fcurve = transform_action.fcurves.new('rotation_euler', index=2)
-            for index, location in enumerate(transform['zRot']):
-                if locations == 1:
-                    pointx = 1
-                else:
-                    pointx = ((index * image_scene_frames)/(locations - 1)) + 1
-                pointy = 3.14159265358979 * (transform['zRot'][index][0]) / 180
-                pointsize = (transform['zRot'][index][1]) * (image_scene_frames / locations / 2)
-                point = fcurve.keyframe_points.insert(frame=pointx, value=pointy)
-                point.interpolation = transform_interpolation
-                point.handle_left_type = 'FREE'
-                point.handle_right_type = 'FREE'
-                point.handle_left = (pointx - pointsize, pointy)
-                point.handle_right = (pointx + pointsize, pointy)
-        if 'xLoc' in transform.keys():
-            locations = len(transform['xLoc'])
-            fcurve = transform_action.fcurves.new('location', index=0)
-            for index, location in enumerate(transform['xLoc']):
-                if locations == 1:
-                    pointx = 1
-                else:
-                    pointx = ((index * image_scene_frames)/(locations - 1)) + 1
-                pointy = (transform['xLoc'][index][0]) * aspect_ratio(bpy.context.scene)
-                pointsize = (transform['xLoc'][index][1]) * (image_scene_frames / locations / 2)
-                point = fcurve.keyframe_points.insert(frame=pointx, value=pointy)
-                point.interpolation = transform_interpolation
-                point.handle_left_type = 'FREE'
-                point.handle_right_type = 'FREE'
-                point.handle_left = (pointx - pointsize, pointy)
-                point.handle_right = (pointx + pointsize, pointy)
-        if 'influence' in transform.keys():
-            constraint = transform_empty.constraints.new(type='COPY_LOCATION')
-            constraint.use_z = False
-            constraint.target = target_empty
-            constraint.influence = 0
-            locations = len(transform['influence'])
-            fcurve = transform_action.fcurves.new('constraints[0].influence')
-            for index, location in enumerate(transform['influence']):
-                if locations == 1:
-                    pointx = 1
-                else:
-                    pointx = ((index * image_scene_frames)/(locations - 1)) + 1
-                pointy = transform['influence'][index][0]
-                pointsize = (transform['influence'][index][1]) * (image_scene_frames / locations / 2)
-                point = fcurve.keyframe_points.insert(frame=pointx, value=pointy)
-                point.interpolation = transform_interpolation
-                point.handle_left_type = 'FREE'
-                point.handle_right_type = 'FREE'
-                point.handle_left = (pointx - pointsize, pointy)
-                point.handle_right = (pointx + pointsize, pointy)
-
-        if not transform_empty.animation_data.action_slot:
-            transform_empty.animation_data.action_slot = transform_action.slots[0]
-
-        camera = add_object(image_scene, generator_scene.name+' Camera', 'CAMERA')
-        camera.parent = transform_empty
-        image_scene.camera = camera
-        camera.data.dof.focus_object = image_plane
-        camera.data.dof.use_dof = False
-
-        camera_scale = add_object(image_scene, generator_scene.name+' Camera Scale', 'EMPTY')
-        camera_scale.parent = image_plane
-        transform_empty.parent = camera_scale
-        camera_scale.location = view_empty.location
-        camera_scale.rotation_euler = view_empty.rotation_euler
-        camera_scale_value = (view_empty.scale[1] * 2)
-        camera_scale.scale = (camera_scale_value, camera_scale_value, camera_scale_value)
-
-        if image_plane.slideshow.extra != 'None':
-            extra = get_extra(image_plane.slideshow.extra)
-            if extra:
-                current_scene = bpy.context.window.scene
-                try:
-                    folder = os.path.split(extra)[0]
-                    file = os.path.splitext(os.path.split(extra)[1])[0]
-                    sys.path.insert(0, folder)
-                    script = __import__(file)
-                    sys.path.remove(folder)
-                    image = load_image(bpy.path.abspath(image_plane.slideshow.extratexture))
-                    material = image_plane.material_slots[0].material
-                    material_nodes = get_material_elements(material, image_plane.slideshow.name)
-                    if material_nodes is not None:
-                        data = {
-                            'image_scene': image_scene,
-                            'image_plane': image_plane,
-                            'material': material,
-                            'material_texture': material_nodes['texture'],
-                            'material_shadeless': material_nodes['shadeless'],
-                            'material_shaded': material_nodes['shaded'],
-                            'material_mix': material_nodes['mix'],
-                            'material_output': material_nodes['output'],
-                            'target_empty': target_empty,
-                            'camera': camera,
-                            'extra_amount': image_plane.slideshow.extraamount,
-                            'extra_text': image_plane.slideshow.extratext,
-                            'extra_texture': image}
-                        script.extra(data)
-                    del script
-                    bpy.context.window.scene = current_scene
-                except ImportError:
-                    pass
-
-        clip = generator_scene.sequence_editor.sequences.new_scene(scene=image_scene, name=image_scene.name, channel=((i % 2) + 1), frame_start=image_scene_start)
+            clip = add_overlay_meta(generator_scene, image_scene, overlay, ((i % 2) + 1), image_scene_start)
 
     else:
         print('Importing Clip: '+image_scene_name)
@@ -1085,8 +2072,13 @@ def create_slideshow_slide(image_plane, i, generator_scene, image_scene_start, i
         if blur_background:
             base_channel = base_channel + 3
 
-        bpy.ops.sequencer.select_all(action='DESELECT')
-        clip = generator_scene.sequence_editor.sequences.new_movie(filepath=image_plane.slideshow.videofile, name=image_plane.name, channel=base_channel, frame_start=image_scene_start)
+        if blur_background:
+            meta_channel = blur_base_channel
+        else:
+            meta_channel = base_channel
+        meta = generator_scene.sequence_editor.sequences.new_meta(name=image_plane.name, channel=meta_channel, frame_start=image_scene_start)
+        strips = meta.sequences
+        clip = strips.new_movie(filepath=image_plane.slideshow.videofile, name=image_plane.name, channel=base_channel, frame_start=image_scene_start)
         flipped = False
         if rotate == '90':
             flipped = True
@@ -1096,11 +2088,6 @@ def create_slideshow_slide(image_plane, i, generator_scene, image_scene_start, i
         elif rotate == '-90':
             flipped = True
             clip.transform.rotation = math.pi / 2
-        if blur_background:
-            blur_clip = generator_scene.sequence_editor.sequences.new_movie(filepath=image_plane.slideshow.videofile, name=image_plane.name, channel=blur_base_channel, frame_start=image_scene_start)
-            blur_clip.transform.rotation = clip.transform.rotation
-        else:
-            blur_clip = None
 
         image = get_image(image_plane.slideshow.videofile)
         clip_x = image.size[0]
@@ -1128,97 +2115,47 @@ def create_slideshow_slide(image_plane, i, generator_scene, image_scene_start, i
 
         clip.transform.scale_x = video_scale
         clip.transform.scale_y = video_scale
-        if blur_background:
-            blur_clip.transform.scale_x = blur_scale
-            blur_clip.transform.scale_y = blur_scale
 
-        speed_clip = None
         audioclip = None
-        blur_speed_clip = None
-        blur_blur_clip = None
         if image_plane.slideshow.videoaudio:
-            audioclip = generator_scene.sequence_editor.sequences.new_sound(filepath=image_plane.slideshow.videofile, name=image_plane.name, channel=base_channel +2, frame_start=image_scene_start)
+            audioclip = strips.new_sound(filepath=image_plane.slideshow.videofile, name=image_plane.name, channel=base_channel +2, frame_start=image_scene_start)
             if audioclip.frame_duration == 0:
-                generator_scene.sequence_editor.sequences.remove(audioclip)
+                strips.remove(audioclip)
                 print('No Audio Found For This Clip')
                 audioclip = None
 
             else:
-                generator_scene.frame_current = image_scene_start
-                audioclip.volume = 0
-                audioclip.keyframe_insert(data_path='volume')
-                generator_scene.frame_current = image_scene_start + generator_scene.snu_slideshow_generator.crossfade_length
-                audioclip.volume = 1
-                audioclip.keyframe_insert(data_path='volume')
-                generator_scene.frame_current = audioclip.frame_final_end - generator_scene.snu_slideshow_generator.crossfade_length
-                audioclip.keyframe_insert(data_path='volume')
-                generator_scene.frame_current = audioclip.frame_final_end
-                audioclip.volume = 0
-                audioclip.keyframe_insert(data_path='volume')
+                crossfade_length = generator_scene.snu_slideshow_generator.crossfade_length
+                keyframe_strip(generator_scene, audioclip, 'volume', [(image_scene_start, 0), (image_scene_start + crossfade_length, 1), (audioclip.frame_final_end - crossfade_length, 1), (audioclip.frame_final_end, 0)])
                 length_percent = image_scene_frames / clip.frame_final_duration
                 if audioclip.frame_final_duration != clip.frame_final_duration:
-                    speed_clip = generator_scene.sequence_editor.sequences.new_effect(name='Speed', type='SPEED', channel=clip.channel+1, seq1=clip, frame_start=clip.frame_final_start)
+                    strips.new_effect(name='Speed', type='SPEED', channel=clip.channel+1, seq1=clip, frame_start=clip.frame_final_start)
                     if audioclip.frame_final_duration > 1:
                         clip.frame_final_duration = audioclip.frame_final_duration
-                    if blur_background:
-                        blur_speed_clip = generator_scene.sequence_editor.sequences.new_effect(name='Speed', type='SPEED', channel=blur_clip.channel+1, seq1=blur_clip, frame_start=blur_clip.frame_final_start)
-                        blur_clip.frame_final_duration = clip.frame_final_duration
                 image_scene_frames = audioclip.frame_final_duration * length_percent
 
-        if speed_clip:
-            apply_transform = speed_clip
-            if blur_background:
-                blur_apply_transform = blur_speed_clip
-            else:
-                blur_apply_transform = None
-        else:
-            apply_transform = clip
-            if blur_background:
-                blur_apply_transform = blur_clip
-            else:
-                blur_apply_transform = None
-        apply_transform.select = True
         if blur_background:
-            blur_apply_transform.select = True
-        if blur_background:
-            blur_blur_clip = generator_scene.sequence_editor.sequences.new_effect(name='Blur', type='GAUSSIAN_BLUR', channel=blur_apply_transform.channel+1, seq1=blur_apply_transform, frame_start=blur_apply_transform.frame_final_start)
-            blur_blur_clip.size_x = 40
-            blur_blur_clip.size_y = 40
-
-        generator_scene.sequence_editor.active_strip = clip
-        if blur_clip:
-            blur_clip.select = True
-        if blur_speed_clip:
-            blur_speed_clip.select = True
-        if blur_blur_clip:
-            blur_blur_clip.select = True
-        if speed_clip:
-            speed_clip.select = True
-        if audioclip:
-            audioclip.select = True
-        clip.select = True
-
-        bpy.ops.sequencer.meta_make()
-        clip = generator_scene.sequence_editor.active_strip
+            # The blurred fill is rendered once at a small size and stretched up to the frame
+            directory, files = blurred_video_background(generator_scene, bpy.path.abspath(image_plane.slideshow.videofile), clip.transform.rotation, blur_scale, render_settings)
+            elements = stretch_files(files, clip.frame_final_duration)
+        else:
+            elements = []
+        if elements:
+            blur_clip = strips.new_image(name=image_plane.name+' Background', filepath=os.path.join(directory, elements[0]), channel=blur_base_channel, frame_start=image_scene_start, fit_method='STRETCH')
+            for element in elements[1:]:
+                blur_clip.elements.append(element)
+
+        clip = meta
 
         offset = image_plane.slideshow.videooffset
         clip.frame_offset_start = offset
         clip.frame_start = image_scene_start - offset
         if image_plane.slideshow.videolength < clip.frame_final_duration:
             clip.frame_final_duration = image_plane.slideshow.videolength
-        if blur_background:
-            clip.channel = blur_base_channel
-        else:
-            clip.channel = base_channel
 
     if i == 0:
         clip.blend_type = 'ALPHA_OVER'
-        generator_scene.frame_current = 1
-        clip.blend_alpha = 0
-        clip.keyframe_insert(data_path='blend_alpha')
-        generator_scene.frame_current = generator_scene.snu_slideshow_generator.crossfade_length
-        clip.blend_alpha = 1
-        clip.keyframe_insert(data_path='blend_alpha')
+        keyframe_strip(generator_scene, clip, 'blend_alpha', [(1, 0), (generator_scene.snu_slideshow_generator.crossfade_length, 1)])
 
     if generator_scene.snu_slideshow_generator.crossfade_length > 0:
         if previous_image_clip and previous_image_plane:
@@ -1252,37 +2189,12 @@ def create_slideshow_slide(image_plane, i, generator_scene, image_scene_start, i
                     effect_channel = second_sequence.channel
                 if second_sequence.channel > first_sequence.channel:
                     inverted = False
-                    start_color = (0, 0, 0)
-                    end_color = (1, 1, 1)
                     apply_mask_to = second_sequence
                 else:
                     inverted = True
-                    start_color = (1, 1, 1)
-                    end_color = (0, 0, 0)
                     apply_mask_to = first_sequence
-                bpy.ops.sequencer.select_all(action='DESELECT')
                 file_path = bpy.path.abspath(previous_image_plane.slideshow.custom_transition_file)
-                effect = generator_scene.sequence_editor.sequences.new_movie(filepath=file_path, name=previous_image_plane.name+' Transition', channel=effect_channel + 1, frame_start=second_sequence.frame_final_start + 1)
-                effect.frame_final_end = first_sequence.frame_final_end - 1
-                if inverted:
-                    invert_modifier = effect.modifiers.new(name='Invert Colors', type='CURVES')
-                    invert_modifier.curve_mapping.curves[3].points[0].location = (0, 1)
-                    invert_modifier.curve_mapping.curves[3].points[1].location = (1, 0)
-                effect_speed = generator_scene.sequence_editor.sequences.new_effect(name='Speed', type='SPEED', channel=effect.channel + 1, seq1=effect, frame_start=effect.frame_final_start)
-                effect_final = generator_scene.sequence_editor.sequences.new_effect(name='Color', type='COLOR', channel=effect.channel, frame_start=effect.frame_final_end, frame_end=effect.frame_final_end + 1)
-                effect_final.frame_final_end = effect_final.frame_final_start + 1
-                effect_final.color = end_color
-                effect_start = generator_scene.sequence_editor.sequences.new_effect(name='Color', type='COLOR', channel=effect.channel, frame_start=effect.frame_final_start - 1, frame_end=effect.frame_final_start)
-                effect_start.frame_final_end = effect_start.frame_final_start + 1
-                effect_start.color = start_color
-                effect.select = True
-                effect_speed.select = True
-                effect_final.select = True
-                effect_start.select = True
-                bpy.ops.sequencer.meta_make()
-                effect = generator_scene.sequence_editor.active_strip
-                effect.name = previous_image_clip.name+' to '+clip.name
-                effect.channel = effect_channel + 1
+                effect = add_transition_mask(generator_scene, file_path, inverted, previous_image_clip.name+' to '+clip.name, effect_channel + 1, second_sequence.frame_final_start, first_sequence.frame_final_end, render_settings)
                 effect.mute = True
                 apply_mask_to.blend_type = 'ALPHA_OVER'
                 modifier = apply_mask_to.modifiers.new(name='Transition from '+first_sequence.name, type='MASK')
@@ -1295,13 +2207,9 @@ def create_slideshow_slide(image_plane, i, generator_scene, image_scene_start, i
 
     if i == (len(images) - 1):
         clip.blend_type = 'ALPHA_OVER'
-        generator_scene.frame_current = int(image_scene_start + image_scene_frames)
-        clip.blend_alpha = 0
-        clip.keyframe_insert(data_path='blend_alpha')
-        generator_scene.frame_current = int(image_scene_start + image_scene_frames - generator_scene.snu_slideshow_generator.crossfade_length)
-        clip.blend_alpha = 1
-        clip.keyframe_insert(data_path='blend_alpha')
-        generator_scene.frame_current = 1
+        fade_end = int(image_scene_start + image_scene_frames)
+        fade_start = int(image_scene_start + image_scene_frames - generator_scene.snu_slideshow_generator.crossfade_length)
+        keyframe_strip(generator_scene, clip, 'blend_alpha', [(fade_start, 1), (fade_end, 0)])
 
     return clip
 
@@ -1320,7 +2228,7 @@ def list_extras():
     extraspath = extras_path()
     extrafiles = glob.glob(extraspath+'*')
     for file in extrafiles:
-        if os.path.splitext(file)[1] == '.py':
+        if os.path.splitext(file)[1] == '.py' and not os.path.split(file)[1].startswith('_'):
             extras.append(os.path.splitext(os.path.split(file)[1])[0])
     return extras
 
@@ -1330,11 +2238,354 @@ def get_extra(filename):
     extraspath = extras_path()
     extrafiles = glob.glob(extraspath+'*')
     for file in extrafiles:
-        if os.path.splitext(os.path.split(file)[1])[0] == filename:
+        if os.path.splitext(os.path.split(file)[1])[0] == filename and not filename.startswith('_'):
             extra = file
     return extra
 
 
+def bind_extra_tools():
+    """Pass the shared datablock and aspect ratio helpers to the tools module that extras import"""
+    tools = sys.modules.get('_extra_tools')
+    if tools is not None:
+        tools.get_shared_datablock = get_shared_datablock
+        tools.aspect_ratio = aspect_ratio
+
+
+def load_extra(name):
+    """Returns the imported module of an extra, or None for 'None' or a missing extra.
+    Modules are cached and only imported again when the script file changes."""
+    if name == 'None':
+        return None
+    extra = get_extra(name)
+    if not extra:
+        return None
+    modified = os.path.getmtime(extra)
+    cached = extra_modules.get(extra)
+    if cached is not None and cached[0] == modified:
+        return cached[1]
+    folder = os.path.split(extra)[0]
+    file = os.path.splitext(os.path.split(extra)[1])[0]
+    sys.path.insert(0, folder)
+    try:
+        script = __import__(file)
+        bind_extra_tools()
+        if cached is not None:
+            script = importlib.reload(script)
+    except ImportError:
+        script = None
+    finally:
+        sys.path.remove(folder)
+    extra_modules[extra] = (modified, script)
+    return script
+
+
+def get_extra_metadata(name):
+    """Returns the metadata of an extra, the values from the 'metadata' dictionary of the script over extra_metadata_defaults"""
+    metadata = dict(extra_metadata_defaults)
+    if name == 'None':
+        metadata.update(no_extra_metadata)
+        return metadata
+    script = load_extra(name)
+    if script is not None:
+        metadata.update(getattr(script, 'metadata', {}))
+    return metadata
+
+
+def prepare_extras(generator_scene, slides):
+    """Run the prepare hook of every extra used by the slides once, before the slide scenes are built"""
+    slides_by_extra = {}
+    for slide in slides:
+        if not slide.slideshow.videofile:
+            slides_by_extra.setdefault(slide.slideshow.extra, []).append(slide)
+    for name, extra_slides in slides_by_extra.items():
+        prepare = get_extra_metadata(name)['prepare']
+        if prepare is not None:
+            prepare({'generator_scene': generator_scene, 'slides': extra_slides, 'cache_directory': get_cache_directory(generator_scene)})
+
+
+def slide_scene_name(generator_scene, image_plane):
+    return generator_scene.snu_slideshow_generator.base_name + '-' + image_plane.name
+
+
+def split_by_cost(slides, groups):
+    """Split slides into groups with about the same total extra cost, the most expensive slides come first in each group"""
+    slides = sorted(slides, key=lambda slide: get_extra_metadata(slide.slideshow.extra)['cost'], reverse=True)
+    split = [[] for index in range(groups)]
+    totals = [0.0] * groups
+    for slide in slides:
+        index = totals.index(min(totals))
+        split[index].append(slide)
+        totals[index] += get_extra_metadata(slide.slideshow.extra)['cost']
+    return [group for group in split if group]
+
+
+def get_proxy_directory(generator_scene, filepath):
+    """Returns the proxy directory of a movie file, in the shared proxy cache and named by the contents of the file"""
+    directory = bpy.path.abspath(generator_scene.snu_slideshow_generator.proxy_directory)
+    if not directory:
+        directory = os.path.join(get_cache_directory(generator_scene), 'proxies')
+    return os.path.join(directory, file_content_hash(filepath)[:16])
+
+
+def set_movie_proxy(strip, directory):
+    """Set up a movie strip to use 25% and 50% proxies and a record run timecode index stored in directory"""
+    strip.use_proxy = True
+    proxy = strip.proxy
+    proxy.build_25 = True
+    proxy.build_50 = True
+    proxy.build_75 = False
+    proxy.build_100 = False
+    proxy.build_record_run = True
+    proxy.timecode = 'RECORD_RUN'
+    proxy.use_overwrite = False
+    proxy.use_proxy_custom_directory = True
+    proxy.directory = directory
+
+
+def write_proxy_marker(directory, filepath):
+    """Mark a proxy directory as being built by this process"""
+    with open(os.path.join(directory, 'building'), 'w') as building:
+        json.dump({'source': filepath, 'pid': os.getpid(), 'time': time.time()}, building)
+
+
+def proxy_build_running(directory):
+    """Returns True if the proxies in directory are being built by a process that is still running.
+    Markers left by crashed or killed workers, or older than a day, are stale."""
+    marker = os.path.join(directory, 'building')
+    if not os.path.isfile(marker):
+        return False
+    try:
+        with open(marker) as building:
+            info = json.load(building)
+        if time.time() - info['time'] > 86400:
+            return False
+        if os.name == 'posix':
+            os.kill(info['pid'], 0)
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+    return True
+
+
+def build_movie_proxies(generator_scene):
+    """Set up proxies for all movie strips in the slideshow, and build the missing ones in background Blender processes.
+    The strips play from the original file until their proxies are done."""
+    movies = {}
+    for strip in generator_scene.sequence_editor.sequences_all:
+        if strip.type != 'MOVIE':
+            continue
+        filepath = bpy.path.abspath(strip.filepath)
+        if not os.path.isfile(filepath):
+            continue
+        if filepath not in movies:
+            movies[filepath] = get_proxy_directory(generator_scene, filepath)
+        set_movie_proxy(strip, movies[filepath])
+
+    missing = []
+    for filepath, directory in movies.items():
+        if os.path.isfile(os.path.join(directory, 'built.json')) or proxy_build_running(directory):
+            continue
+        os.makedirs(directory, exist_ok=True)
+        write_proxy_marker(directory, filepath)
+        missing.append([filepath, directory])
+    if not missing:
+        return
+
+    workers = min(len(missing), max(generator_scene.snu_slideshow_generator.build_workers, 1))
+    for index in range(workers):
+        arguments = json.dumps({'movies': missing[index::workers]})
+        command = [bpy.app.binary_path, '-b', '--python-expr', 'import importlib; importlib.import_module('+repr(__name__)+').run_proxy_worker()', '--', arguments]
+        print('Starting proxy worker '+str(index)+' for '+str(len(missing[index::workers]))+' movies')
+        subprocess.Popen(command)
+
+
+def run_proxy_worker():
+    """Entry point of a background proxy process, builds the proxies and timecode indexes of the movies it was given"""
+    arguments = json.loads(sys.argv[sys.argv.index('--') + 1])
+    proxy_scene = bpy.data.scenes.new('Slideshow Proxies')
+    proxy_scene.sequence_editor_create()
+    for filepath, directory in arguments['movies']:
+        write_proxy_marker(directory, filepath)
+    for filepath, directory in arguments['movies']:
+        print('Building proxies: '+filepath)
+        write_proxy_marker(directory, filepath)
+        try:
+            strip = proxy_scene.sequence_editor.sequences.new_movie(name='Proxy', filepath=filepath, channel=1, frame_start=1)
+            set_movie_proxy(strip, directory)
+            strip.select = True
+            with bpy.context.temp_override(scene=proxy_scene):
+                bpy.ops.sequencer.rebuild_proxy()
+            proxy_scene.sequence_editor.sequences.remove(strip)
+            with open(os.path.join(directory, 'built.json'), 'w') as built:
+                json.dump({'source': filepath}, built)
+        except Exception as e:
+            print(f"Error building proxies for {filepath}: {e}")
+        finally:
+            if os.path.isfile(os.path.join(directory, 'building')):
+                os.remove(os.path.join(directory, 'building'))
+
+
+def build_slides_in_workers(generator_scene, slides, render_settings):
+    """Build the scenes of image slides that changed in background Blender processes, then append them to this file.
+    The slide scenes are reused by create_slideshow_slide afterwards, so only the sequencer is assembled here."""
+    worker_built_scenes.clear()
+    workers = generator_scene.snu_slideshow_generator.build_workers
+    incremental = generator_scene.snu_slideshow_generator.incremental_build
+    dirty = []
+    for slide in slides:
+        if slide.slideshow.videofile:
+            continue
+        slide_hash = slide_build_hash(slide, generator_scene, render_settings)
+        if not incremental or find_built_scene(slide, slide_scene_name(generator_scene, slide), slide_hash) is None:
+            dirty.append(slide)
+    if workers < 1 or len(dirty) < 2:
+        return
+
+    #cached files shared between slides are made here first, so workers do not write them at the same time
+    for slide in dirty:
+        if get_extra_metadata(slide.slideshow.extra)['uses_texture']:
+            get_extra_texture(generator_scene, slide.slideshow.extratexture, render_settings)
+
+    cache_directory = get_cache_directory(generator_scene)
+    directory = os.path.join(cache_directory, 'workers')
+    os.makedirs(directory, exist_ok=True)
+    source = os.path.join(directory, 'source.blend')
+    bpy.ops.wm.save_as_mainfile(filepath=source, copy=True)
+
+    processes = []
+    for index, group in enumerate(split_by_cost(dirty, workers)):
+        output = os.path.join(directory, 'worker'+str(index)+'.blend')
+        if os.path.isfile(output):
+            os.remove(output)
+        arguments = json.dumps({
+            'generator': generator_scene.name,
+            'slides': [slide.name for slide in group],
+            'cache_directory': cache_directory,
+            'output': output})
+        command = [bpy.app.binary_path, '-b', source, '--python-expr', 'import importlib; importlib.import_module('+repr(__name__)+').run_build_worker()', '--', arguments]
+        print('Starting build worker '+str(index)+' for '+str(len(group))+' slides')
+        processes.append((subprocess.Popen(command), output, group))
+
+    for process, output, group in processes:
+        process.wait()
+        if process.returncode != 0 or not os.path.isfile(output):
+            print('Build worker failed, its slides will be built here: '+output)
+            continue
+        append_worker_scenes(generator_scene, output, group)
+
+
+def run_build_worker():
+    """Entry point of a background build process, builds the slide scenes it was given and writes them to a .blend file"""
+    arguments = json.loads(sys.argv[sys.argv.index('--') + 1])
+    generator_scene = bpy.data.scenes[arguments['generator']]
+    generator_scene.snu_slideshow_generator.cache_directory = arguments['cache_directory']
+    for collection_name in worker_source_collections:
+        for datablock in getattr(bpy.data, collection_name):
+            datablock['snu_worker_source'] = datablock.name
+    render_settings = snapshot_render_settings(generator_scene)
+    slides = [generator_scene.objects[name] for name in arguments['slides']]
+    prepare_extras(generator_scene, slides)
+    scenes = set()
+    for slide in slides:
+        image_scene = build_slide_scene(slide, generator_scene, slide_scene_name(generator_scene, slide), render_settings)
+        image_scene['snu_build_hash'] = slide_build_hash(slide, generator_scene, render_settings)
+        scenes.add(image_scene)
+    #copies made while building, such as render planes, carry the tag of the datablock they were copied from
+    for collection_name in worker_source_collections:
+        for datablock in getattr(bpy.data, collection_name):
+            if datablock.get('snu_worker_source', datablock.name) != datablock.name:
+                del datablock['snu_worker_source']
+    bpy.data.libraries.write(arguments['output'], scenes, fake_user=True)
+
+
+def append_worker_scenes(generator_scene, output, slides):
+    """Append the scenes built by a worker, data the worker copied from this file is replaced by the originals"""
+    for slide in slides:
+        purge_owned_data(slide, 'scene')
+        old_scene = bpy.data.scenes.get(slide_scene_name(generator_scene, slide))
+        if old_scene is not None:
+            bpy.data.scenes.remove(old_scene)
+    existing = set()
+    for collection_name in worker_source_collections:
+        for datablock in getattr(bpy.data, collection_name):
+            existing.add(datablock.as_pointer())
+
+    with bpy.data.libraries.load(output, link=False) as (data_from, data_to):
+        data_to.scenes = list(data_from.scenes)
+
+    duplicates = []
+    for collection_name in worker_source_collections:
+        collection = getattr(bpy.data, collection_name)
+        shared = {}
+        for datablock in collection:
+            if datablock.as_pointer() in existing and 'snu_shared_key' in datablock:
+                shared[datablock['snu_shared_key']] = datablock
+        for datablock in collection:
+            if datablock.as_pointer() in existing:
+                continue
+            original = None
+            if 'snu_worker_source' in datablock:
+                original = collection.get(datablock['snu_worker_source'])
+            elif 'snu_shared_key' in datablock:
+                original = shared.get(datablock['snu_shared_key'])
+            if original is not None and original.as_pointer() in existing:
+                datablock.user_remap(original)
+                duplicates.append(datablock)
+            elif 'snu_worker_source' in datablock:
+                del datablock['snu_worker_source']
+    if duplicates:
+        bpy.data.batch_remove(duplicates)
+
+    for slide in slides:
+        image_scene = bpy.data.scenes.get(slide_scene_name(generator_scene, slide))
+        if image_scene is None:
+            continue
+        image_scene.use_fake_user = False
+        generator_objects = [scene_object for scene_object in image_scene.objects if generator_scene.objects.get(scene_object.name) == scene_object]
+        own_scene_data(slide, image_scene, generator_objects, 'scene')
+        worker_built_scenes.add(image_scene.name)
+
+
+def compile_transform(transform):
+    """Convert a transform definition into arrays of (position, value, handle size) for each channel.
+    Position and handle size are relative to the slide length, results are cached by transform name."""
+    compiled = compiled_transforms.get(transform['name'])
+    if compiled is None:
+        compiled = {}
+        for channel, data_path, data_index in transform_channels:
+            if channel in transform:
+                points = np.array(transform[channel], dtype=np.float64)
+                count = len(points)
+                if count == 1:
+                    positions = np.zeros(1)
+                else:
+                    positions = np.arange(count) / (count - 1)
+                compiled[channel] = (positions, points[:, 0], points[:, 1] / count / 2)
+        compiled_transforms[transform['name']] = compiled
+    return compiled
+
+
+def add_keyframes(fcurve, frames, values, handle_sizes, interpolation):
+    """Add all keyframes to an fcurve at once, with free handles extending horizontally by handle_sizes"""
+    count = len(frames)
+    co = np.empty(count * 2, dtype=np.float32)
+    co[0::2] = frames
+    co[1::2] = values
+    handle_left = co.copy()
+    handle_left[0::2] -= handle_sizes
+    handle_right = co.copy()
+    handle_right[0::2] += handle_sizes
+
+    points = fcurve.keyframe_points
+    points.add(count)
+    points.foreach_set('handle_left_type', np.full(count, keyframe_handle_types['FREE'], dtype=np.int32))
+    points.foreach_set('handle_right_type', np.full(count, keyframe_handle_types['FREE'], dtype=np.int32))
+    points.foreach_set('interpolation', np.full(count, keyframe_interpolations[interpolation], dtype=np.int32))
+    points.foreach_set('co', co)
+    points.foreach_set('handle_left', handle_left)
+    points.foreach_set('handle_right', handle_right)
+    fcurve.update()
+
+
 def get_transform(name):
     for index, transform in enumerate(transforms):
         if transform['name'] == name:
@@ -1342,24 +2593,27 @@ def get_transform(name):
     return -1
 
 
+def update_label(context, name, text):
+    label = context.scene.objects.get(name)
+    if label is not None:
+        label.data.body = text
+    redraw_3d_views(context)
+
+
 def update_slide_length(self, context):
-    current_scene = context.scene
-    length_text = current_scene.objects[self.name+" Length"]
-    length_text.data.body = "Length: "+str(round(self.length, 2))+" Seconds"
+    update_label(context, self.name+" Length", "Length: "+str(round(self.length, 2))+" Seconds")
 
 
 def update_video_length(self, context):
-    current_scene = context.scene
-    length_text = current_scene.objects[self.name+" Length"]
     if self.videolength + self.videooffset > self.videomaxlength:
         self.videolength = self.videomaxlength - self.videooffset
-    length_text.data.body = "Length: "+str(self.videolength)+" Frames"
+    update_label(context, self.name+" Length", "Length: "+str(self.videolength)+" Frames")
 
 
 def update_offset(self, context):
     current_scene = context.scene
     image_plane = current_scene.objects[self.name]
-    material = image_plane.material_slots[0].material
+    material = get_slide_material(image_plane)
     material_nodes = get_material_elements(material, image_plane.slideshow.name)
     if material_nodes is None:
         return
@@ -1375,18 +2629,14 @@ def update_offset(self, context):
 
 def update_extra(self, context):
     try:
-        current_scene = context.scene
-        extra_text = current_scene.objects[self.name+" Extra"]
-        extra_text.data.body = "Extra: "+self.extra
+        update_label(context, self.name+" Extra", "Extra: "+self.extra)
     except:
         pass
 
 
 def update_transform(self, context):
     try:
-        current_scene = context.scene
-        transform_text = current_scene.objects[self.name+" Transform"]
-        transform_text.data.body = "Transform: "+self.transform
+        update_label(context, self.name+" Transform", "Transform: "+self.transform)
     except:
         pass
 
@@ -1396,15 +2646,14 @@ def update_index(self, context):
     image_plane = current_scene.objects[self.name]
     position = -self.index
     image_plane.location = (0.0, position, 0.0)
-    index_text = current_scene.objects[self.name+" Index"]
-    index_text.data.body = str(self.index + 1)
+    update_label(context, self.name+" Index", str(self.index + 1))
 
 
 def update_rotate(self, context):
     current_scene = context.scene
     image_plane = current_scene.objects[self.name]
     mesh = image_plane.data
-    material = image_plane.material_slots[0].material
+    material = get_slide_material(image_plane)
     material_nodes = get_material_elements(material, image_plane.slideshow.name)
     if material_nodes is None:
         return
@@ -1521,6 +2770,71 @@ def update_order(mode='none', current_scene=None):
             slide.slideshow.index = i
 
 
+def use_label_objects():
+    """Slide labels are drawn in the 3d view, font objects are only needed when there is nothing to draw them"""
+    return bpy.app.background
+
+
+def redraw_3d_views(context):
+    if context.screen is None:
+        return
+    for area in context.screen.areas:
+        if area.type == 'VIEW_3D':
+            area.tag_redraw()
+
+
+def slide_labels(slide):
+    """Returns a list of (text, location, size, align) for the labels of a slide, location is relative to the slide"""
+    slideshow = slide.slideshow
+    labels = [(str(slideshow.index + 1), (-1, -.33, 0), 1, 'RIGHT')]
+    if slideshow.videofile:
+        labels.append(("Length: "+str(slideshow.videolength)+" Frames", (1, .25, 0), .15, 'LEFT'))
+    else:
+        labels.append(("Transform: "+slideshow.transform, (1, 0, 0), .15, 'LEFT'))
+        labels.append(("Extra: "+slideshow.extra, (1, -.25, 0), .15, 'LEFT'))
+        labels.append(("Length: "+str(round(slideshow.length, 2))+" Seconds", (1, .25, 0), .15, 'LEFT'))
+    return labels
+
+
+def draw_slide_labels():
+    """Draw handler for the 3d view, draws the index, transform, extra and length labels of every slide"""
+    context = bpy.context
+    scene = context.scene
+    if not is_generator_scene(scene):
+        return
+    region = context.region
+    region_3d = context.region_data
+    if region is None or region_3d is None:
+        return
+    origin = location_3d_to_region_2d(region, region_3d, (0, 0, 0))
+    unit = location_3d_to_region_2d(region, region_3d, (0, 1, 0))
+    if origin is None or unit is None:
+        return
+    pixels_per_unit = (unit - origin).length
+
+    font_id = 0
+    blf.color(font_id, 1, 1, 1, 1)
+    for slide in list_slides(scene):
+        if slide.name+" Index" in scene.objects:
+            #Older generator scenes still have their labels as font objects
+            continue
+        for text, location, size, align in slide_labels(slide):
+            font_size = pixels_per_unit * size
+            if font_size < 4:
+                continue
+            position = location_3d_to_region_2d(region, region_3d, slide.matrix_world @ Vector(location))
+            if position is None:
+                continue
+            if position[1] < -font_size or position[1] > region.height + font_size:
+                continue
+            blf.size(font_id, font_size)
+            x = position[0]
+            if align == 'RIGHT':
+                x = x - blf.dimensions(font_id, text)[0]
+            blf.position(font_id, x, position[1], 0)
+            blf.draw(font_id, text)
+
+
 def get_first_3d_view():
     for area in bpy.context.screen.areas:
         if area.type == 'VIEW_3D':
@@ -1543,6 +2857,22 @@ class SnuSlideshowExtraTexturePreset(bpy.types.PropertyGroup):
     )
 
 
+class SnuSlideshowOwnedData(bpy.types.PropertyGroup):
+    """A property group recording a datablock that was created for a slide"""
+    name: bpy.props.StringProperty(
+        name="Datablock Name",
+        default=""
+    )
+    id_type: bpy.props.StringProperty(
+        name="Datablock Type",
+        default=""
+    )
+    group: bpy.props.StringProperty(
+        name="Slide Part",
+        default=""
+    )
+
+
 class SnuSlideshowImage(bpy.types.PropertyGroup):
     """A property group that contains the information needed for a slideshow image"""
     name: bpy.props.StringProperty(
@@ -1740,6 +3070,32 @@ class SnuSlideshowImage(bpy.types.PropertyGroup):
         default="",
         description="Where this photo was taken"
     )
+    atlas_page: bpy.props.IntProperty(
+        name="Thumbnail Atlas Page",
+        default=-1
+    )
+    atlas_cell: bpy.props.IntProperty(
+        name="Thumbnail Atlas Cell",
+        default=0
+    )
+    owned_data: bpy.props.CollectionProperty(
+        type=SnuSlideshowOwnedData
+    )
+    lock_type: bpy.props.StringProperty(
+        name="Lock Type",
+        default="",
+        description="Determines how this object may be moved, rotated and scaled in the generator scene"
+    )
+    lock_location: bpy.props.FloatVectorProperty(
+        name="Locked Location",
+        size=3,
+        default=(0.0, 0.0, 0.0)
+    )
+    lock_scale: bpy.props.FloatVectorProperty(
+        name="Locked Scale",
+        size=3,
+        default=(1.0, 1.0, 1.0)
+    )
     has_text_file: bpy.props.BoolProperty(
         name="Has Text File",
         default=False,
@@ -1767,6 +3123,16 @@ class SnuSlideshowGeneratorSettings(bpy.types.PropertyGroup):
         ],
         default='LEFT'
     )
+    text_overlay_mode: EnumProperty(
+        name="Text Overlay Mode",
+        description="How slide text overlays are made",
+        items=[
+            ('SCENE', "Scene", "Render the text in a 3D scene for each slide"),
+            ('SHARED', "Single Scene", "Render the text of all slides in one 3D scene with shared materials"),
+            ('STRIPS', "Strips", "Use sequencer text strips, much faster to render"),
+        ],
+        default='SCENE'
+    )
     text_size: bpy.props.FloatProperty(
         name="Text Size",
         description="Size of the overlay text",
@@ -1838,6 +3204,11 @@ class SnuSlideshowGeneratorSettings(bpy.types.PropertyGroup):
         min=0,
         max=600
     )
+    audio_premix: bpy.props.BoolProperty(
+        name="Premix",
+        description="Mix the looped audio track with its fades into one cached file, instead of adding a strip for every loop",
+        default=False
+    )
     base_name: bpy.props.StringProperty(
         name="Base Name For Created Scenes",
         default=''
@@ -1858,6 +3229,50 @@ class SnuSlideshowGeneratorSettings(bpy.types.PropertyGroup):
         default=24,
         max=128
     )
+    cache_directory: bpy.props.StringProperty(
+        name="Cache Directory",
+        default='//slideshow_cache/',
+        description="Location where prerendered images and videos used by slides are stored, so they only have to be made once",
+        subtype='DIR_PATH'
+    )
+    build_proxies: bpy.props.BoolProperty(
+        name="Build Video Proxies",
+        default=True,
+        description="Build 25% and 50% proxies and timecode indexes for video strips in the background, so the slideshow plays back smoothly while editing"
+    )
+    proxy_directory: bpy.props.StringProperty(
+        name="Proxy Directory",
+        default='',
+        description="Location where video proxies are stored, shared between slideshows. Uses the cache directory if empty",
+        subtype='DIR_PATH'
+    )
+    build_workers: bpy.props.IntProperty(
+        name="Build Workers",
+        default=0,
+        min=0,
+        max=64,
+        description="Number of background Blender processes that build changed slide scenes in parallel, 0 builds every slide in this process"
+    )
+    transcode_extra_textures: bpy.props.BoolProperty(
+        name="Transcode Video Extra Textures",
+        default=False,
+        description="Convert video extra textures once to an image sequence at the render resolution in the cache directory, so slides do not each decode the video"
+    )
+    overlay_extras: bpy.props.BoolProperty(
+        name="Composite Overlay Extras",
+        default=False,
+        description="Extras that only add camera space overlays, such as vignettes, are prerendered once and composited in the sequencer instead of being rendered in every slide"
+    )
+    cache_text_overlays: bpy.props.BoolProperty(
+        name="Cache Text Overlays",
+        default=False,
+        description="In scene text overlay mode, render each different text overlay once to the cache directory and reuse it for every slide with the same text"
+    )
+    incremental_build: bpy.props.BoolProperty(
+        name="Reuse Unchanged Slides",
+        default=True,
+        description="When creating the slideshow again, keep the scenes of slides whose settings have not changed instead of rebuilding them"
+    )
 
 
 # PANELS
@@ -1918,6 +3333,17 @@ class SSG_PT_Panel(bpy.types.Panel):
             row.prop(context.scene.snu_slideshow_generator, "crossfade_length")
             row = layout.row()
             row.prop(context.scene.snu_slideshow_generator, "render_samples")
+            row.prop(context.scene.snu_slideshow_generator, "incremental_build")
+            row = layout.row()
+            row.prop(context.scene.snu_slideshow_generator, "cache_directory")
+            row = layout.row()
+            row.prop(context.scene.snu_slideshow_generator, "overlay_extras")
+            row.prop(context.scene.snu_slideshow_generator, "transcode_extra_textures")
+            row = layout.row()
+            row.prop(context.scene.snu_slideshow_generator, "build_workers")
+            row = layout.row()
+            row.prop(context.scene.snu_slideshow_generator, "build_proxies")
+            row.prop(context.scene.snu_slideshow_generator, "proxy_directory", text="")
             
             row = layout.row()
             box = row.box()
@@ -1932,6 +3358,7 @@ class SSG_PT_Panel(bpy.types.Panel):
             row = box.row()
             row.prop(context.scene.snu_slideshow_generator, "audio_loop_fade")
             row.prop(context.scene.snu_slideshow_generator, "audio_fade_length")
+            row.prop(context.scene.snu_slideshow_generator, "audio_premix")
             if not context.scene.snu_slideshow_generator.audio_enabled:
                 row.enabled = False
             
@@ -1942,6 +3369,12 @@ class SSG_PT_Panel(bpy.types.Panel):
             row = box.row()
             row.label(text="Text Overlay Settings:")
             row = box.row()
+            row.prop(context.scene.snu_slideshow_generator, "text_overlay_mode", expand=True)
+            row = box.row()
+            row.prop(context.scene.snu_slideshow_generator, "cache_text_overlays")
+            if context.scene.snu_slideshow_generator.text_overlay_mode != 'SCENE':
+                row.enabled = False
+            row = box.row()
             row.prop(context.scene.snu_slideshow_generator, "text_alignment")
             row = box.row()
             row.prop(context.scene.snu_slideshow_generator, "text_size")
@@ -2319,15 +3752,16 @@ class SnuSlideshowAddSlide(bpy.types.Operator):
             if os.path.isfile(filename):
                 extension = os.path.splitext(filename)[1].lower()
                 if extension in get_extensions_image():
-                    image = load_image(filename)
+                    image = index_image(load_image(filename))
                     image_number = len(list_slides(generator_scene))
                     last_image = import_slideshow_image(image, image_number, generator_scene.snu_slideshow_generator.slide_length, generator_scene, video=False, last_image=last_image)
                 elif extension in get_extensions_video():
-                    image = load_image(filename)
+                    image = index_image(load_image(filename))
                     image_number = len(list_slides(generator_scene))
                     last_image = import_slideshow_image(image, image_number, generator_scene.snu_slideshow_generator.slide_length, generator_scene, video=True, last_image=last_image)
                 else:
                     self.report({'WARNING'}, os.path.split(filename)[1]+' Is Not An Image')
+        update_thumbnail_atlas(generator_scene)
         select_plane(last_image, generator_scene)
         return{'FINISHED'}
 
@@ -2706,6 +4140,7 @@ class SnuSlideshowDeleteSlide(bpy.types.Operator):
                 selected_slides.append(selected)
         bpy.ops.object.select_all(action='DESELECT')
         for selected in selected_slides:
+            purge_owned_data(selected)
             context.view_layer.objects.active = selected
             selected.select_set(True)
             bpy.ops.object.select_grouped(extend=True, type='CHILDREN_RECURSIVE')
@@ -2810,15 +4245,29 @@ class SnuSlideshowCreate(bpy.types.Operator):
 
         images = list_slides(generator_scene)
         images.sort(key=lambda x: x.slideshow.index)
+        render_settings = snapshot_render_settings(generator_scene)
+        prepare_extras(generator_scene, images)
+        build_slides_in_workers(generator_scene, images, render_settings)
         previous_image_clip = None
         previous_image_plane = None
+        text_mode = generator_scene.snu_slideshow_generator.text_overlay_mode
+        text_slide_clips = []
         for i, image_plane in enumerate(images):
-            previous_image_clip = create_slideshow_slide(image_plane, i, generator_scene, image_scene_start, images, previous_image_clip, previous_image_plane)
+            previous_image_clip = create_slideshow_slide(image_plane, i, generator_scene, image_scene_start, images, previous_image_clip, previous_image_plane, render_settings)
             previous_image_plane = image_plane
             image_scene_start = previous_image_clip.frame_final_end - generator_scene.snu_slideshow_generator.crossfade_length
             
-            if image_plane.slideshow.enable_text_overlay and image_plane.slideshow.has_text_file:
-                text_scene = create_slide_text_overlay_scene_with_improved_outline(generator_scene, image_plane, image_plane.slideshow.length)
+            if image_plane.slideshow.enable_text_overlay and image_plane.slideshow.has_text_file and text_mode == 'STRIPS':
+                purge_owned_data(image_plane, 'text')
+                add_text_overlay_strips(generator_scene, image_plane, previous_image_clip)
+            elif image_plane.slideshow.enable_text_overlay and image_plane.slideshow.has_text_file and text_mode == 'SHARED':
+                purge_owned_data(image_plane, 'text')
+                text_slide_clips.append((image_plane, previous_image_clip))
+            elif image_plane.slideshow.enable_text_overlay and image_plane.slideshow.has_text_file and generator_scene.snu_slideshow_generator.cache_text_overlays:
+                purge_owned_data(image_plane, 'text')
+                add_cached_text_overlay(generator_scene, image_plane, previous_image_clip, render_settings)
+            elif image_plane.slideshow.enable_text_overlay and image_plane.slideshow.has_text_file:
+                text_scene = get_text_overlay_scene(generator_scene, image_plane, render_settings)
                 if text_scene:
                     text_clip = generator_scene.sequence_editor.sequences.new_scene(
                         scene=text_scene, 
@@ -2828,6 +4277,17 @@ class SnuSlideshowCreate(bpy.types.Operator):
                     )
                     text_clip.frame_final_end = previous_image_clip.frame_final_end
                     text_clip.blend_type = 'ALPHA_OVER'
+            else:
+                # Text is off for this slide, remove what an earlier build made for it
+                purge_owned_data(image_plane, 'text')
+        if text_mode == 'SHARED':
+            add_shared_text_overlay(generator_scene, text_slide_clips, render_settings)
+        else:
+            # The other modes make their text per slide, so a shared scene from an earlier build is left over
+            remove_shared_text_overlay(generator_scene)
+        purge_unused_shared_data()
+        if generator_scene.snu_slideshow_generator.build_proxies:
+            build_movie_proxies(generator_scene)
 
         self.report({'INFO'}, "Slideshow created")
 
@@ -2839,30 +4299,35 @@ class SnuSlideshowCreate(bpy.types.Operator):
             if os.path.exists(filename):
                 extension = os.path.splitext(generator_scene.snu_slideshow_generator.audio_track)[1].lower()
                 if extension in bpy.path.extensions_audio:
-                    audio_frame_end = 0
-                    i = 0
-                    audio_sequence = None
-                    while audio_frame_end < generator_scene.frame_end:
-                        if audio_frame_end == 0:
-                            frame_start = 1
-                        else:
-                            frame_start = audio_frame_end+1-generator_scene.snu_slideshow_generator.audio_loop_fade
-
-                        audio_sequence = generator_scene.sequence_editor.sequences.new_sound(name='Audio', filepath=filename, channel=6+(i % 2), frame_start=frame_start)
-
-                        if audio_sequence.frame_duration > 0:
-                            audio_frame_end = audio_sequence.frame_final_end
-                        else:
-                            audio_frame_end = generator_scene.frame_end
-                        i += 1
-
-                    if audio_sequence:
-                        audio_sequence.frame_final_end = generator_scene.frame_end
-                        generator_scene.frame_current = generator_scene.frame_end - generator_scene.snu_slideshow_generator.audio_fade_length
-                        audio_sequence.keyframe_insert(data_path='volume')
-                        generator_scene.frame_current = generator_scene.frame_end
-                        audio_sequence.volume = 0
-                        audio_sequence.keyframe_insert(data_path='volume')
+                    # Both the premix and the looped strips end after the last frame of the scene, frame_final_end is exclusive
+                    audio_end = generator_scene.frame_end + 1
+                    mix_file = None
+                    if generator_scene.snu_slideshow_generator.audio_premix:
+                        mix_file = premix_audio_track(generator_scene, filename)
+                    if mix_file:
+                        audio_sequence = generator_scene.sequence_editor.sequences.new_sound(name='Audio', filepath=mix_file, channel=6, frame_start=1)
+                        audio_sequence.frame_final_end = audio_end
+                    else:
+                        audio_frame_end = 0
+                        i = 0
+                        audio_sequence = None
+                        while audio_frame_end < audio_end:
+                            if audio_frame_end == 0:
+                                frame_start = 1
+                            else:
+                                frame_start = audio_frame_end+1-generator_scene.snu_slideshow_generator.audio_loop_fade
+
+                            audio_sequence = generator_scene.sequence_editor.sequences.new_sound(name='Audio', filepath=filename, channel=6+(i % 2), frame_start=frame_start)
+
+                            if audio_sequence.frame_duration > 0:
+                                audio_frame_end = audio_sequence.frame_final_end
+                            else:
+                                audio_frame_end = audio_end
+                            i += 1
+
+                        if audio_sequence:
+                            audio_sequence.frame_final_end = audio_end
+                            keyframe_strip(generator_scene, audio_sequence, 'volume', [(audio_end - generator_scene.snu_slideshow_generator.audio_fade_length, audio_sequence.volume), (audio_end, 0)])
 
         try:
             context.window.workspace = bpy.data.workspaces['Video Editing']
@@ -2961,10 +4426,11 @@ class SnuSlideshowGenerator(bpy.types.Operator):
         last_image = None
         for import_data in imports:
             image_file, is_video = import_data
-            image = load_image(image_file)
+            image = index_image(load_image(image_file))
             last_image = import_slideshow_image(image, image_number, slide_length, generator_scene, video=is_video, last_image=last_image)
             image_number += 1
 
+        update_thumbnail_atlas(generator_scene)
         select_plane(last_image, generator_scene)
         context.scene.cursor.location = (0, 0, 0)
         print("Now displaying images, this may take a while...")
@@ -2978,6 +4444,7 @@ class SnuSlideshowGenerator(bpy.types.Operator):
 # REGISTRATION
 classes = [
     SnuSlideshowExtraTexturePreset, 
+    SnuSlideshowOwnedData,
     SnuSlideshowImage, 
     SnuSlideshowGeneratorSettings,
     SSG_PT_VSEPanel, 
@@ -3012,9 +4479,14 @@ classes = [
 ]
 
 def cleanup_typewriter_handlers():
-    """Remove typewriter frame handlers"""
-    if typewriter_frame_handler in bpy.app.handlers.frame_change_pre:
-        bpy.app.handlers.frame_change_pre.remove(typewriter_frame_handler)
+    """Remove typewriter frame handlers, including ones left from an earlier load of the addon"""
+    handlers = bpy.app.handlers.frame_change_pre
+    for handler in list(handlers):
+        if " typewriter_frame_handler " in str(handler):
+            handlers.remove(handler)
+
+
+label_draw_handlers = []
 
 
 def register():
@@ -3029,9 +4501,16 @@ def register():
         if " slideshow_autoupdate " in str(handler):
             handlers.remove(handler)
     handlers.append(slideshow_autoupdate)
+    cleanup_typewriter_handlers()
+    bpy.app.handlers.frame_change_pre.append(typewriter_frame_handler)
+
+    label_draw_handlers.append(bpy.types.SpaceView3D.draw_handler_add(draw_slide_labels, (), 'WINDOW', 'POST_PIXEL'))
 
 def unregister():
     cleanup_typewriter_handlers()
+    for draw_handler in label_draw_handlers:
+        bpy.types.SpaceView3D.draw_handler_remove(draw_handler, 'WINDOW')
+    label_draw_handlers.clear()
     handlers = bpy.app.handlers.depsgraph_update_post
     for handler in handlers:
         if " slideshow_autoupdate " in str(handler):
@@ -3177,7 +4656,7 @@ def add_synchronized_fade(materials, fps, total_frames, start_frame=1, fade_pct_
             pass
 
 
-def create_typewriter_text_with_improved_outline(scene, text_content, name, location=(0, 0, 0), size=1.0, alignment='LEFT', start_frame=1, total_frames=None):
+def create_typewriter_text_with_improved_outline(scene, text_content, name, location=(0, 0, 0), size=1.0, alignment='LEFT', start_frame=1, total_frames=None, shared_materials=False):
     """Improved version with unique materials and synchronized fade."""
     safe_scene_name = getattr(scene, "name", "Scene").replace(" ", "_")
     outline_mat_name = f"{safe_scene_name}_{name}_OutlineMaterial"
@@ -3223,8 +4702,12 @@ def create_typewriter_text_with_improved_outline(scene, text_content, name, loca
     outline_obj.rotation_euler = main_obj.rotation_euler
     outline_obj.scale = main_obj.scale
 
-    outline_material = create_outline_material(outline_mat_name)
-    main_material = create_text_material(main_mat_name)
+    if shared_materials:
+        outline_material = shared_text_material('Text Outline Material', "OutlineEmission", (0.0, 0.0, 0.0, 1.0), 3.0)
+        main_material = shared_text_material('Text Material', "TextEmission", (1.0, 1.0, 1.0, 1.0), 4.0)
+    else:
+        outline_material = create_outline_material(outline_mat_name)
+        main_material = create_text_material(main_mat_name)
 
     outline_obj.data.materials.clear()
     main_obj.data.materials.clear()
@@ -3242,10 +4725,8 @@ def create_typewriter_text_with_improved_outline(scene, text_content, name, loca
     except Exception:
         pass
 
-    scene.view_layers.update()
-
-    animation_duration = add_typewriter_animation_robust(main_obj, text_content, scene, start_frame)
-    add_typewriter_animation_robust(outline_obj, text_content, scene, start_frame)
+    animation_duration = add_typewriter_animation(main_obj, text_content, scene, start_frame)
+    add_typewriter_animation(outline_obj, text_content, scene, start_frame)
 
     if total_frames:
         fps = get_fps(scene)